@@ -5,6 +5,7 @@ from collections import defaultdict
 from dataclasses import dataclass
 from datetime import UTC
 from datetime import datetime
+from datetime import timedelta
 from decimal import Decimal
 
 from .config import configure_logging
@@ -266,6 +267,9 @@ TIMEFRAME_MINUTES = {
     "M1": 1, "M5": 5, "M15": 15, "M30": 30, "H1": 60,
     "H4": 240, "D1": 1440, "W1": 10080, "MN": 43200,
 }
+# Precomputed per-timeframe lookups so callers skip the function call and arithmetic
+TF_SECONDS = {tf: minutes * 60 for tf, minutes in TIMEFRAME_MINUTES.items()}
+TF_BUCKET_SPAN = {tf: timedelta(minutes=minutes) for tf, minutes in TIMEFRAME_MINUTES.items()}
 
 def get_timeframe_minutes(timeframe: str) -> int:
     if timeframe not in TIMEFRAME_MINUTES:
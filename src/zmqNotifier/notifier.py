@@ -22,13 +22,16 @@ The system uses BucketedSlidingAggregator to track historical data across multip
 timeframes (M1, M5, M30, etc.) for each monitored symbol.
 """
 
+from collections import defaultdict
 from datetime import datetime, timedelta
 from decimal import Decimal
+import heapq
 import logging
+import time
 
 from zmqNotifier.tick_agg import BucketedSlidingAggregator, AggStates, Message, init_msg_from_scores
-from zmqNotifier.models import TickData
-from zmqNotifier.market_data import get_timeframe_minutes
+from zmqNotifier.models import TickData, from_fixed
+from zmqNotifier.market_data import TF_BUCKET_SPAN, TF_SECONDS
 from zmqNotifier.config import AppSettings, get_settings, SymbolTrackerConfig
 
 logger = logging.getLogger(__name__)
@@ -41,24 +44,72 @@ class VolatilityNotifier:
     it notifies when the thresholds are exceeded. There is cooldown in the length of small window
 
     on_tick(): Ingests ticks and drive SymbolTracks, notificiation manager's flush()
+    on_ticks(): Micro-batch variant of on_tick(), scoring and flushing once per batch;
+        NOT equivalent to on_tick() per tick (intermediate alerts are dropped)
+    on_tick_by_id(): on_tick() for callers that cached an id from symbol_id()
     update_config(): Update notifier configuration and sync trackers/aggregators.
     """
 
     def __init__(self, config: AppSettings | None = None):
         self.config = config or get_settings()
         self._trackers: dict[str, SymbolTracker] = {}
+        # Stable integer ids for per-tick dispatch: an id keeps its slot for the life of
+        # the notifier (None while the symbol is not configured), so callers may cache it
+        self._symbol_to_id: dict[str, int] = {}
+        self._tracker_list: list[SymbolTracker | None] = []
         # Initialize trackers for all configured symbols
         for symbol in self.config.notifier.symbols.keys():
-            self._trackers[symbol] = SymbolTracker(symbol, self)
+            self._register_tracker(symbol)
+
+    def symbol_id(self, symbol: str) -> int | None:
+        """Stable dispatch id for symbol, or None if it has never been configured."""
+        return self._symbol_to_id.get(symbol)
 
     def on_tick(self, symbol: str, tick: TickData):
-        tracker = self._trackers.get(symbol)
-        if tracker is None:
+        sid = self._symbol_to_id.get(symbol)
+        if sid is None or self._tracker_list[sid] is None:
             logger.warning("No tracker configured for symbol %s", symbol)
             return
+        self.on_tick_by_id(sid, tick)
+
+    def on_tick_by_id(self, sid: int, tick: TickData):
+        """Dispatch a tick by the id returned from symbol_id()."""
+        tracker = self._tracker_list[sid]
+        if tracker is None:
+            return
+
+        # Most ticks enqueue nothing; only touch the manager when there may be work
+        if tracker.on_tick(tick) or notify_manager.pending:
+            notify_manager.flush()
+
+    def on_ticks(self, ticks: list[tuple[str, TickData]]):
+        """
+        Ingest a micro-batch of (symbol, tick) pairs.
+
+        Ticks are grouped by symbol (keeping their relative order) and each tracker
+        scores once at the end of its group, so per-tick dispatch, scoring and flush
+        overhead is paid once per batch.
+
+        This is not the same as calling on_tick() for each tick: only the scores at the
+        end of a batch are seen, so an alert that escalates or rises and falls back
+        within a batch is reported at most once (or not at all), and cooldowns step
+        down once per batch rather than once per tick. Use on_tick() when every
+        intermediate alert matters.
+        """
+        by_symbol: defaultdict[str, list[TickData]] = defaultdict(list)
+        for symbol, tick in ticks:
+            by_symbol[symbol].append(tick)
+
+        enqueued = False
+        for symbol, symbol_ticks in by_symbol.items():
+            tracker = self._trackers.get(symbol)
+            if tracker is None:
+                logger.warning("No tracker configured for symbol %s", symbol)
+                continue
+            enqueued |= tracker.on_ticks(symbol_ticks)
 
-        tracker.on_tick(tick)
-        notify_manager.flush()
+        if enqueued or notify_manager.pending:
+            notify_manager.flush()
 
     def update_config(self, config: AppSettings):
         """
@@ -74,12 +125,16 @@ class VolatilityNotifier:
             config: New AppSettings instance with updated notifier.symbols
 
         Design notes:
-            - Aggregators don't store thresholds; they query config each time
+            - Aggregators don't store thresholds; trackers cache the resolved config
+              and are refreshed here via SymbolTracker.invalidate_cache()
             - Existing aggregator history is preserved when timeframes remain
             - Cooldown state is preserved for existing timeframes
             - New aggregators start with empty history and reset cooldown
         """
         self.config = config
+        # Trackers cache their resolved config; refresh before syncing aggregators
+        for tracker in self._trackers.values():
+            tracker.invalidate_cache()
 
         current_symbols = set(self._trackers.keys())
         new_symbols = set(self.config.notifier.symbols.keys())
@@ -103,6 +158,7 @@ class VolatilityNotifier:
         for symbol in symbols_to_remove:
             logger.info("Removing tracker for symbol %s (no longer in config)", symbol)
             del self._trackers[symbol]
+            self._tracker_list[self._symbol_to_id[symbol]] = None
 
         return symbols_to_remove
 
@@ -111,10 +167,19 @@ class VolatilityNotifier:
 
         for symbol in symbols_to_add:
             logger.info("Adding tracker for new symbol %s", symbol)
-            self._trackers[symbol] = SymbolTracker(symbol, self)
+            self._register_tracker(symbol)
 
         return symbols_to_add
 
+    def _register_tracker(self, symbol: str) -> None:
+        tracker = self._trackers[symbol] = SymbolTracker(symbol, self)
+        sid = self._symbol_to_id.get(symbol)
+        if sid is None:
+            self._symbol_to_id[symbol] = len(self._tracker_list)
+            self._tracker_list.append(tracker)
+        else:
+            self._tracker_list[sid] = tracker
+
     def _sync_existing_trackers(self, symbols: set[str]) -> None:
         for symbol in symbols:
             tracker = self._trackers[symbol]
@@ -122,12 +187,12 @@ class VolatilityNotifier:
 
             if thresholds is None:
                 logger.warning("Symbol %s has no thresholds, removing all aggregators", symbol)
-                for tf in list(tracker._aggregators.keys()):
+                for tf in tracker.timeframes:
                     tracker.remove_agg(tf)
                 continue
 
             desired_tfs = set(thresholds.keys())
-            current_tfs = set(tracker._aggregators.keys())
+            current_tfs = set(tracker.timeframes)
 
             tfs_to_remove = current_tfs - desired_tfs
             for tf in tfs_to_remove:
@@ -187,6 +252,18 @@ class SymbolTracker:
         self._master = master
         self._aggregators: dict[str, BucketedSlidingAggregator] = {}
         self._agg_states: dict[str, AggStates] = {}
+        # Pip scale comes from the symbol's quote precision, never the mid's: an odd
+        # bid + ask adds a half-pip digit that would inflate every later score 10x.
+        # It only widens while trailing zeros hide digits of the first quotes.
+        self._pip_digits = 0
+        # Per-tick iteration snapshot of (tf, agg, state, vol_threshold, act_threshold),
+        # rebuilt whenever aggregators or config change; _aggregators stays the registry
+        self._tf_loop: tuple[tuple[str, BucketedSlidingAggregator, AggStates, int, int], ...] = ()
+        self._min_buckets = 0
+        # Resolved config for this symbol, refreshed by invalidate_cache()
+        self._cached_thresholds: dict[str, tuple[int, int]] | None = None
+        self._cached_tracker_cfg: SymbolTrackerConfig | None = None
+        self._load_config()
 
         # Get configuration from master
         thresholds = self.thresholds
@@ -207,19 +284,51 @@ class SymbolTracker:
             list(self._aggregators.keys()),
         )
 
-    def on_tick(self, tick: TickData):
-        if not self._aggregators:
-            return
+    def on_tick(self, tick: TickData) -> bool:
+        """Feed a tick to every aggregator; return True if a notification was enqueued."""
+        tf_loop = self._tf_loop
+        if not tf_loop:
+            return False
 
-        mid_price = (tick.bid + tick.ask) / Decimal(2)
+        mid_price = tick.mid_fixed
+        if tick.quote_digits > self._pip_digits:
+            self._pip_digits = tick.quote_digits
 
         # Feed to all aggregators
-        for agg in self._aggregators.values():
-            agg.add(tick.datetime, mid_price)
+        timestamp = tick.datetime
+        for _, agg, _, _, _ in tf_loop:
+            agg.add(timestamp, mid_price)
+
+        return self._calculate(timestamp, tick.epoch_s)
+
+    def on_ticks(self, ticks: list[TickData]) -> bool:
+        """
+        Feed a batch of ticks to every aggregator, then score once at the last tick.
+
+        Aggregator state matches per-tick ingest, but alerting does not: scores and
+        cooldown stepdown are evaluated only at the last tick (see
+        VolatilityNotifier.on_ticks).
 
-        self._calculate(tick.datetime)
+        Returns:
+            True if a notification was enqueued
+        """
+        tf_loop = self._tf_loop
+        if not tf_loop or not ticks:
+            return False
+
+        timestamps = [tick.datetime for tick in ticks]
+        mid_prices = [tick.mid_fixed for tick in ticks]
+        pip_digits = max(tick.quote_digits for tick in ticks)
+        if pip_digits > self._pip_digits:
+            self._pip_digits = pip_digits
+
+        for _, agg, _, _, _ in tf_loop:
+            agg.add_batch(timestamps, mid_prices)
 
-    def _calculate(self, now: datetime) -> None:
+        last = ticks[-1]
+        return self._calculate(last.datetime, last.epoch_s)
+
+    def _calculate(self, now: datetime, now_s: int) -> bool:
         """
         Calculate multi-dimensional scores and emit notifications for threshold breaches.
 
@@ -251,47 +360,53 @@ class SymbolTracker:
             - Well-formed messages logged and queued for NotificationManager
 
         Args:
-            now: Current tick timestamp for scoring and cooldown checking
-        """
+            now: Current tick timestamp, stamped on emitted messages
+            now_s: Same instant in integer epoch seconds, for cooldown checking
 
-        thresholds = self.thresholds
-        if not thresholds:
-            return
+        Returns:
+            True if at least one message was enqueued to the NotificationManager
+        """
+        enqueued = False
 
-        tracker_config = self.tracker
+        min_buckets_requirement = self._min_buckets
+        symbol = self._symbol
+        pip_digits = self._pip_digits
 
-        for tf, agg in self._aggregators.items():
-            min_buckets_requirement = tracker_config.min_buckets_calculation
+        for tf, agg, state, vol_threshold, act_threshold in self._tf_loop:
             if agg.buckets_count < min_buckets_requirement:
                 continue
 
-            state = self._agg_states[tf]
-            msg = init_msg_from_scores(agg=agg, thresholds=thresholds.get(tf, (None, None)))
+            msg = init_msg_from_scores(
+                agg=agg, thresholds=(vol_threshold, act_threshold), pip_digits=pip_digits
+            )
 
-            state.stepdown(now)
+            state.stepdown(now_s)
             if not msg.is_significant():
                 continue  # early leave
 
-            state.trigger(now)  # msg is significant, postpone stepdown
+            state.trigger(now_s)  # msg is significant, postpone stepdown
             if not state.should_notify(msg):
                 continue
 
             state.update(msg, now)
 
-            msg.symbol = self._symbol
+            msg.symbol = symbol
+            # Mid-price differences can carry a half-pip digit; show quote precision
+            msg.price_change = from_fixed(msg.price_change).quantize(Decimal(1).scaleb(-pip_digits))
             msg.timeframe = tf
             msg.time = now
             msg.direction = "UP" if agg.get_active_direction() > 0 else "DOWN"
 
             if msg.is_well_formed():
                 logger.info("Escalated alert for %s", msg)
-                # TODO: Enqueue to NotificationManager
+                notify_manager.enqueue(msg)
+                enqueued = True
+
+        return enqueued
 
     def _get_timeframe_seconds(self, tf: str) -> int:
         """Convert timeframe code to seconds."""
-        from zmqNotifier.market_data import get_timeframe_minutes
-
-        return get_timeframe_minutes(tf) * 60
+        return TF_SECONDS[tf]
 
     def add_agg(self, tf: str):
         if tf in self._aggregators:
@@ -300,11 +415,13 @@ class SymbolTracker:
 
         tracker_config = self.tracker
 
-        # Convert timeframe to timedelta for bucket_span
-        tf_minutes = get_timeframe_minutes(tf)
-        bucket_span = timedelta(minutes=tf_minutes)
+        bucket_span = TF_BUCKET_SPAN.get(tf)
+        if bucket_span is None:
+            msg = f"Unsupported timeframe: {tf}"
+            raise ValueError(msg)
 
-        # Determine max_window (number of buckets to retain)
+        # Determine max_window (number of buckets to retain); timeframes missing from
+        # num_bucket_retention keep their whole history (O(n log n) sparse table levels)
         max_window = None
         if tracker_config.num_bucket_retention:
             max_window = tracker_config.num_bucket_retention.get(tf)
@@ -315,6 +432,7 @@ class SymbolTracker:
         cooldown_unit = tracker_config.cooldown_unit
         cooldown_seconds = cooldown_unit * self._get_timeframe_seconds(tf)
         self._agg_states[tf] = AggStates(cooldown_seconds=cooldown_seconds)
+        self.refresh_tf_loop()
 
         logger.debug(
             "Added aggregator for %s/%s with bucket_span=%s, max_window=%s",
@@ -337,16 +455,51 @@ class SymbolTracker:
 
         del self._aggregators[tf]
         del self._agg_states[tf]
+        self.refresh_tf_loop()
 
         logger.debug("Removed aggregator for %s/%s", self._symbol, tf)
 
+    def refresh_tf_loop(self) -> None:
+        """
+        Rebuild the per-tick iteration snapshot from the aggregators and current config.
+
+        Called after add_agg/remove_agg and by invalidate_cache so that threshold
+        changes still take effect on the next tick.
+        """
+        thresholds = self.thresholds
+        if not thresholds:
+            self._tf_loop = ()
+            return
+
+        self._min_buckets = self.tracker.min_buckets_calculation
+        self._tf_loop = tuple(
+            (tf, agg, self._agg_states[tf], *thresholds.get(tf, (None, None)))
+            for tf, agg in self._aggregators.items()
+        )
+
+    def invalidate_cache(self) -> None:
+        """Re-resolve thresholds and tracker config from master (call on config change)."""
+        self._load_config()
+        self.refresh_tf_loop()
+
+    def _load_config(self) -> None:
+        notifier_config = self._master.config.notifier
+        self._cached_thresholds = notifier_config.thresholds_for(self._symbol)
+        self._cached_tracker_cfg = notifier_config.resolve_tracker_config(self._symbol)
+
+    @property
+    def timeframes(self) -> list[str]:
+        """Timeframes with a registered aggregator (a copy, safe to mutate through)."""
+        return list(self._aggregators)
+
     @property
     def thresholds(self) -> dict[str, tuple[int, int]] | None:
-        return self._master.config.notifier.thresholds_for(self._symbol)
+        return self._cached_thresholds
 
     @property
     def tracker(self) -> SymbolTrackerConfig:
-        return self._master.config.notifier.resolve_tracker_config(self._symbol)
+        assert self._cached_tracker_cfg is not None  # set by _load_config in __init__
+        return self._cached_tracker_cfg
 
 
 class NotificationManager:
@@ -370,25 +523,36 @@ class NotificationManager:
 
     def __init__(self):
         # initialize TelegramNotifier backend from settings
-        # initialize priority queue
-        # initialize time for flush
-        pass
+        # Min-heap keyed (-score, -tf_seconds, seq): highest score first, then larger
+        # timeframe, then arrival order (seq also keeps Messages out of comparisons)
+        self._heap: list[tuple[int, int, int, Message]] = []
+        self._seq = 0
+        self._interval = self.FLUSH_INTERVAL.total_seconds()
+        self._next_flush = 0.0  # time.monotonic() deadline of the next allowed flush
+
+    @property
+    def pending(self) -> int:
+        """Number of queued messages awaiting flush."""
+        return len(self._heap)
 
     def enqueue(self, msg: Message):
         """
-        Add an AggStates notification to the priority queue.
+        Add an alert message to the priority queue in O(log n).
 
         Args:
-            state: AggStates containing symbol, timeframe, scores, and notification timestamps
+            msg: Well-formed Message with symbol, timeframe, scores, and timestamp
         """
-        pass
+        tf_seconds = TF_SECONDS.get(msg.timeframe, 0)
+        heapq.heappush(self._heap, (-msg.score, -tf_seconds, self._seq, msg))
+        self._seq += 1
 
-    def _format_batch_summary(self):
+    def _format_batch_summary(self) -> str:
         """
-        Format queued AggStates into a batched summary message.
+        Drain the queue and format it into a batched summary message.
 
-        Groups states by symbol, orders by priority (magnitude and timeframe),
-        and formats as a concise alert message.
+        Groups messages by symbol, orders by priority (magnitude and timeframe),
+        and formats as a concise alert message. Symbols are listed in the order of
+        their highest-priority message.
 
         Example output:
 
@@ -400,12 +564,39 @@ class NotificationManager:
         Volatility: 120 pips since {V}, Activity: 300 ticks since {A}
         ...
         """
-        pass
+        by_symbol: defaultdict[str | None, list[Message]] = defaultdict(list)
+        heap = self._heap
+        while heap:
+            msg = heapq.heappop(heap)[3]
+            by_symbol[msg.symbol].append(msg)
+
+        headline = " ".join(
+            f"{symbol} {msgs[0].direction} {'!' * max(1, msgs[0].volatility_score)}"
+            for symbol, msgs in by_symbol.items()
+        )
+        lines = [headline, ""]
+        for symbol, msgs in by_symbol.items():
+            for msg in msgs:
+                lines.append(f"# {symbol} {msg.timeframe} {msg.direction}")
+                lines.append(
+                    f"Volatility: {msg.price_change} (score {msg.volatility_score}), "
+                    f"Activity: {msg.tick_count} ticks (score {msg.activity_score})"
+                )
+        return "\n".join(lines)
+
+    def flush(self) -> None:
+        """Send queued messages as one batch, at most once per FLUSH_INTERVAL."""
+        # Cheap exits first: this runs on the tick path
+        if not self._heap:
+            return
+        now = time.monotonic()
+        if now < self._next_flush:
+            return
 
-    def flush(self):
         # compile batch msg
+        self._format_batch_summary()
+        self._next_flush = now + self._interval
         # telegram send batch
-        pass
 
 
 notify_manager = NotificationManager()
@@ -0,0 +1,226 @@
+"""
+Sparse table implementation for O(1) range min/max/count queries.
+
+This module provides an append-only sparse table over condensed buckets. Unlike the
+segment tree it trades O(n log n) space for constant-time queries, which suits the
+aggregator: every tick queries several lookback ranges while buckets are only appended
+(and evicted from the front) once per bucket span.
+"""
+
+import math
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from zmqNotifier.tick_agg import Bucket
+
+POS_INF = math.inf
+NEG_INF = -math.inf
+_NEUTRAL = (POS_INF, NEG_INF, 0)
+
+
+class SparseTableMinMax:
+    """
+    Sparse table for O(1) range min/max/count queries over an append-only sequence.
+
+    Level k holds, for every start position i, the min/max/max_count of the 2**k
+    leaves [i, i + 2**k). Levels are stored as parallel lists per field
+    (struct-of-arrays), so level 0 is the leaves themselves:
+    - A range [l, r] is covered by two overlapping blocks of size 2**k, where
+      k = floor(log2(r - l + 1)); min/max/max are idempotent so the overlap is harmless
+    - Appending a leaf adds one entry per level (the blocks that end at the new leaf)
+    - Evicting the oldest leaf only advances an offset; dead prefixes are trimmed from
+      every level once they outnumber the live leaves, since no block starting at a
+      live position reads a dead one
+    - Empty buckets contribute (inf, -inf, 0) and are naturally ignored
+
+    Logical index 0 is always the oldest retained bucket.
+
+    Short ranges are not special-cased with a linear scan: slicing the leaf lists and
+    reducing with min()/max() costs more than the two-block lookup even for 2 buckets.
+
+    Complexity:
+    - Query: O(1)
+    - Append: O(log n)
+    - Evict: O(log n) amortized (prefix trims)
+    - Space: O(n log n)
+    """
+
+    __slots__ = ("_n", "_offset", "_mins", "_maxs", "_counts", "_log2")
+
+    def __init__(self, buckets: Iterable["Bucket"]):
+        """
+        Build the table from buckets in O(n log n) time.
+
+        Args:
+            buckets: Condensed buckets, oldest first (empty buckets are handled)
+        """
+        self._reset()
+        for bucket in buckets:
+            self.append_leaf(bucket.min_value, bucket.max_value, bucket.count)
+
+    def _reset(self) -> None:
+        """Start over with no leaves."""
+        self._n = 0
+        self._offset = 0  # Position of logical index 0 in every level (advanced by evict_leaf)
+        self._mins: list[list[float]] = [[]]
+        self._maxs: list[list[float]] = [[]]
+        self._counts: list[list[int]] = [[]]
+        # _log2[w] == floor(log2(w)): the level answering a range of width w. Grown
+        # with the leaf lists so a query never computes it (a list index is cheaper
+        # than int.bit_length() on this path)
+        self._log2: list[int] = [0]
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getstate__(self) -> tuple[list[float], list[float], list[int]]:
+        """Pickle only the retained leaves; every upper level is derived from them."""
+        offset = self._offset
+        return self._mins[0][offset:], self._maxs[0][offset:], self._counts[0][offset:]
+
+    def __setstate__(self, state: tuple[list[float], list[float], list[int]]) -> None:
+        """Rebuild the levels from pickled leaves in O(n log n)."""
+        self._reset()
+        for min_value, max_value, count in zip(*state, strict=True):
+            self.append_leaf(min_value, max_value, count)
+
+    def query(self, left_idx: int, right_idx: int) -> tuple[float, float, int]:
+        """
+        Query min/max/max_count over bucket index range in O(1) time.
+
+        Args:
+            left_idx: Left bucket index (inclusive)
+            right_idx: Right bucket index (inclusive)
+
+        Returns:
+            (min_value, max_value, max_count) over the range
+
+        Raises:
+            ValueError: If indices are out of bounds or invalid
+        """
+        n = self._n
+        if n == 0:
+            return _NEUTRAL
+        # Range check inlined: this runs several times per tick
+        if left_idx < 0 or right_idx >= n or left_idx > right_idx:
+            self._validate_range(left_idx, right_idx)
+
+        offset = self._offset
+        lo = offset + left_idx
+        level = self._log2[right_idx - left_idx + 1]
+        hi = offset + right_idx - (1 << level) + 1
+
+        mins, maxs, counts = self._mins[level], self._maxs[level], self._counts[level]
+        a, b = mins[lo], mins[hi]
+        res_min = a if a < b else b
+        a, b = maxs[lo], maxs[hi]
+        res_max = a if a > b else b
+        a, b = counts[lo], counts[hi]
+        return res_min, res_max, a if a > b else b
+
+    def leaf(self, idx: int) -> tuple[float, float, int]:
+        """
+        Return (min_value, max_value, count) of the bucket at logical index ``idx``.
+
+        Raises:
+            ValueError: If idx is out of bounds
+        """
+        self._validate_range(idx, idx)
+        pos = self._offset + idx
+        return self._mins[0][pos], self._maxs[0][pos], self._counts[0][pos]
+
+    def leaves(self) -> Iterator[tuple[float, float, int]]:
+        """Iterate (min_value, max_value, count) of the retained buckets, oldest first."""
+        offset = self._offset
+        return zip(
+            self._mins[0][offset:], self._maxs[0][offset:], self._counts[0][offset:], strict=True
+        )
+
+    def append_leaf(self, min_value: float, max_value: float, count: int) -> None:
+        """
+        Append a new rightmost bucket.
+
+        Args:
+            min_value: Bucket minimum
+            max_value: Bucket maximum
+            count: Bucket tick count (0 marks the bucket empty)
+        """
+        if not count:
+            min_value, max_value = POS_INF, NEG_INF
+        all_mins, all_maxs, all_counts = self._mins, self._maxs, self._counts
+        all_mins[0].append(min_value)
+        all_maxs[0].append(max_value)
+        all_counts[0].append(count)
+        self._n += 1
+
+        # The new leaf completes exactly one block per level: the one ending at it. Blocks
+        # reaching into evicted leaves are still filled so each level stays indexed by
+        # leaf position; queries never start before the offset, so they are never read.
+        pos = len(all_mins[0]) - 1
+        log2 = self._log2
+        if len(log2) <= self._n:
+            log2.append(self._n.bit_length() - 1)
+        level, half = 1, 1
+        start = pos - 1
+        while start >= 0:
+            if level == len(all_mins):
+                all_mins.append([])
+                all_maxs.append([])
+                all_counts.append([])
+            prev_mins, prev_maxs, prev_counts = (
+                all_mins[level - 1],
+                all_maxs[level - 1],
+                all_counts[level - 1],
+            )
+            a, b = prev_mins[start], prev_mins[start + half]
+            all_mins[level].append(a if a < b else b)
+            a, b = prev_maxs[start], prev_maxs[start + half]
+            all_maxs[level].append(a if a > b else b)
+            a, b = prev_counts[start], prev_counts[start + half]
+            all_counts[level].append(a if a > b else b)
+            level += 1
+            half *= 2
+            start = pos - 2 * half + 1
+
+    def evict_leaf(self) -> None:
+        """
+        Drop the leftmost (oldest) bucket.
+
+        Raises:
+            LookupError: If the table is empty
+        """
+        if self._n == 0:
+            msg = "sparse table is empty"
+            raise LookupError(msg)
+        self._offset += 1
+        self._n -= 1
+        if self._offset > self._n:
+            self._trim()
+
+    def _trim(self) -> None:
+        """Drop the dead prefix from every level and rebase the offset to 0."""
+        offset = self._offset
+        for level in range(len(self._mins)):
+            del self._mins[level][:offset]
+            del self._maxs[level][:offset]
+            del self._counts[level][:offset]
+        # Levels with no block inside the live leaves end up empty; append_leaf refills
+        # them from position 0 once enough leaves exist
+        self._offset = 0
+
+    def _validate_range(self, left_idx: int, right_idx: int) -> None:
+        """
+        Validate query range indices.
+
+        Args:
+            left_idx: Left index
+            right_idx: Right index
+
+        Raises:
+            ValueError: If indices are invalid
+        """
+        if left_idx < 0 or right_idx >= self._n or left_idx > right_idx:
+            msg = f"Invalid range [{left_idx}, {right_idx}] for table size {self._n}"
+            raise ValueError(msg)
@@ -3,24 +3,36 @@ Tick aggregator with bucketed sliding window support.
 
 This module provides a high-performance tick aggregator that:
 - Groups ticks into fixed-size time buckets (clock-aligned)
-- Maintains active bucket using monotonic deque
+- Maintains the active bucket as running min/max/count scalars
 - Condenses buckets to aggregates on boundary crossing
-- Supports O(log n) range queries via segment tree
+- Supports O(1) range queries via sparse table
 - Tracks maximum tick count across queried buckets for activity analysis
 """
 
-from collections import deque
+import math
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Optional
+from dataclasses import field
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
 from decimal import Decimal
-import math
+from itertools import islice
+from operator import le
+from typing import Optional
 
-from zmqNotifier.segment_tree import SegmentTreeMinMax
-from zmqNotifier.sliding_windows import SlidingWindowMinMax
+from zmqNotifier.models import fixed_into_pip
+from zmqNotifier.sparse_table import SparseTableMinMax
 
-DECIMAL_POS_INF = Decimal("Infinity")
-DECIMAL_NEG_INF = Decimal("-Infinity")
+POS_INF = math.inf
+NEG_INF = -math.inf
+# Bucket ids count spans from the Unix epoch in the ticks' tzinfo. Aggregators start
+# from this naive one, so only aware ticks ever build an epoch (once per aggregator)
+_EPOCH_NAIVE = datetime(1970, 1, 1, tzinfo=UTC).replace(tzinfo=None)
 
 
 # ============================================================================
@@ -28,19 +40,22 @@ DECIMAL_NEG_INF = Decimal("-Infinity")
 # ============================================================================
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Bucket:
     """
     Aggregate for one fixed-size time bucket.
 
     Stores min/max/count for all ticks that fall within the bucket's time range.
-    Condensed from the active deque when crossing bucket boundaries.
+    The aggregator keeps history as columns and only materializes Buckets on request
+    (see BucketedSlidingAggregator.iter_buckets), so a Bucket is a read-only snapshot:
+    it is frozen, as writing to it could never reach the aggregator's history.
+    Empty buckets keep the neutral (inf, -inf) defaults so they merge as no-ops.
     """
 
     start: datetime
     end: datetime
-    min_value: Decimal = DECIMAL_POS_INF
-    max_value: Decimal = DECIMAL_NEG_INF
+    min_value: float = POS_INF
+    max_value: float = NEG_INF
     count: int = 0
 
     @property
@@ -59,13 +74,26 @@ class BucketedSlidingAggregator:
     High-performance tick aggregator with bucketed sliding windows.
 
     Architecture:
-    - Active bucket: Uses SlidingWindowMinMax for O(1) min/max tracking
-    - Historical buckets: Stored as condensed aggregates in a deque
-    - Query optimization: Segment tree for O(log n) range queries
+    - Active bucket: Running min/max (with their timestamps) and tick count scalars
+    - Historical buckets: Stored as condensed aggregates in parallel columns
+    - Query optimization: Sparse table for O(1) range queries
 
     Time Complexity:
-    - add(): O(1) amortized
-    - query_min_max(): O(log n) where n = number of buckets in range
+    - add(): O(1) amortized; a tick inside the active bucket costs one datetime
+      compare against the bucket's end, with no datetime arithmetic. The tick that
+      crosses a boundary computes the new integer bucket id (one exact timedelta floor
+      division) and condenses the finished bucket into the range table in O(log n),
+      so queries never rebuild it. History is keyed by integer bucket ids; datetimes
+      are rebuilt only when iter_buckets() materializes Buckets
+    - query_min_max(): O(1); results are cached per lookback until the next condense.
+      A miss locates the first bucket in O(1) when the history has no gaps since it
+      (an O(log n) bisect otherwise) and reads the sparse table's two blocks in O(1)
+
+    Space Complexity:
+    - O(n log n) for n retained buckets: the sparse table keeps one level per power of
+      two, where the segment tree it replaced kept O(n). With max_window set, n is
+      bounded; with max_window=None every bucket ever condensed is retained, so memory
+      grows as O(n log n) without bound. Long-running trackers should set a retention
 
     Usage:
         agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1))
@@ -81,6 +109,24 @@ class BucketedSlidingAggregator:
         # Useful for identifying most active periods or liquidity analysis
     """
 
+    __slots__ = (
+        "_bucket_span",
+        "_max_window",
+        "_epoch",
+        "_bucket_ids",
+        "_ids_offset",
+        "_active_min",
+        "_active_max",
+        "_active_min_ts",
+        "_active_max_ts",
+        "_active_count",
+        "_last_ts",
+        "_current_bucket_idx",
+        "_current_bucket_end",
+        "_range_table",
+        "_hist_cache",
+    )
+
     def __init__(self, bucket_span: timedelta, max_window: Optional[int] = None):
         """
         Initialize the aggregator.
@@ -95,22 +141,49 @@ class BucketedSlidingAggregator:
         self._bucket_span = bucket_span
         self._max_window = max_window
 
-        # Storage
-        self._buckets: deque[Bucket] = deque()
-        # days=1 make sense, just arbitray large number
-        # to keep all tickes in the partial bucket, as active window is only for current bucket
-        self._active_window = SlidingWindowMinMax(window=timedelta(days=1))
-        self._current_bucket_start: Optional[datetime] = None
-
-        # Query optimization (lazy-built segment tree)
-        self._segment_tree: Optional[SegmentTreeMinMax] = None
-        self._tree_dirty = True
+        # Storage: condensed history is kept column-wise rather than as Bucket objects.
+        # Buckets are identified by their integer index (whole spans since the epoch),
+        # so range lookups are a single bisect over ints, and min/max/count live in the
+        # range table's leaves, indexed in parallel. Start/end datetimes are derived
+        # from the id on demand. The ids sit in a typed array: they are large (millions
+        # of spans since 1970), so a list would hold a separate int object per bucket.
+        self._epoch = _EPOCH_NAIVE  # Unix epoch in the ticks' tzinfo
+        self._bucket_ids = array("q")
+        # Position of the oldest retained id: eviction advances it like a ring buffer's
+        # head, and the dead prefix is trimmed once it outnumbers the retained ids. A
+        # wrapping (power-of-two, masked) ring is deliberately not used: bisect needs the
+        # retained ids in one sorted run, and the sparse table's blocks are addressed by
+        # contiguous position, so a wrap would split every lookup and query in two.
+        self._ids_offset = 0
+        # Active bucket: points never leave it before the boundary resets it, so a
+        # monotonic deque would degenerate to its fronts; running scalars are enough.
+        # Timestamps of the extrema are kept for direction, and on ties the latest
+        # occurrence wins. Neutral (inf, -inf, 0) while no tick is in the bucket.
+        self._active_min: float = POS_INF
+        self._active_max: float = NEG_INF
+        self._active_min_ts: Optional[datetime] = None
+        self._active_max_ts: Optional[datetime] = None
+        self._active_count = 0
+        self._last_ts: Optional[datetime] = None  # Newest tick, for the order check
+        # The active bucket is identified by its integer id; only its end is kept as a
+        # datetime, for the per-tick boundary test (None until the first tick)
+        self._current_bucket_idx = 0
+        self._current_bucket_end: Optional[datetime] = None
+
+        # Query optimization: the sparse table mirrors the bucket ids through O(log n)
+        # appends/evictions, so queries never rebuild it. Every tick queries several
+        # lookback ranges while buckets change once per span, so O(1) queries are worth
+        # its O(n log n) space over a segment tree's O(log n) queries.
+        self._range_table = SparseTableMinMax(())
+        # Historical results per num_buckets; history only changes when a bucket is
+        # condensed, so the scoring loop's repeated lookbacks are dict hits until then
+        self._hist_cache: dict[int, tuple[float, float, int]] = {}
 
     # ========================================================================
     # Public API
     # ========================================================================
 
-    def add(self, timestamp: datetime, value: Decimal) -> None:
+    def add(self, timestamp: datetime, value: float) -> None:
         """
         Add a tick to the aggregator.
 
@@ -118,30 +191,90 @@ class BucketedSlidingAggregator:
 
         Args:
             timestamp: Tick timestamp
-            value: Tick value
+            value: Tick value (fixed-point int price, or float)
 
         Raises:
             ValueError: If timestamp is not non-decreasing
         """
-        self._validate_timestamp(timestamp)
-        if not isinstance(value, Decimal):
-            value = Decimal(str(value))
+        bucket_end = self._current_bucket_end
+        if bucket_end is not None and timestamp < bucket_end:
+            # Fast path: the tick falls inside the active bucket. Only here can it be
+            # older than the newest tick; one at or past the bucket's end is past every
+            # tick seen so far, so this one compare is the whole order check. (Folding it
+            # into a chained ``last <= ts < end`` test measured no faster.)
+            if timestamp < self._last_ts:
+                raise ValueError("timestamps must be non-decreasing")
+            if value <= self._active_min:
+                self._active_min = value
+                self._active_min_ts = timestamp
+            if value >= self._active_max:
+                self._active_max = value
+                self._active_max_ts = timestamp
+            self._active_count += 1
+        else:
+            # Boundary crossing (or first tick): only these pay for alignment
+            self._condense_active_bucket()
+            self._current_bucket_idx, self._current_bucket_end = self._locate_bucket(timestamp)
+            self._active_min = self._active_max = value
+            self._active_min_ts = self._active_max_ts = timestamp
+            self._active_count = 1
+        self._last_ts = timestamp
 
-        bucket_start = self._align_to_bucket_boundary(timestamp)
+    def add_batch(self, timestamps: Sequence[datetime], values: Sequence[float]) -> None:
+        """
+        Add a run of ticks in timestamp order.
 
-        # Handle bucket boundary crossing
-        if self._is_new_bucket(bucket_start):
-            self._condense_active_bucket()
-            self._current_bucket_start = bucket_start
+        Equivalent to calling add() for each (timestamp, value) pair, but each bucket's
+        run of ticks is handled at once: its end is found by bisecting the timestamps and
+        min/max/count are reduced from the value slice by the builtins, in C.
 
-        # Initialize first bucket
-        if self._current_bucket_start is None:
-            self._current_bucket_start = bucket_start
+        Args:
+            timestamps: Tick timestamps (non-decreasing)
+            values: Tick values (list or tuple), same length as timestamps
 
-        # Add to active window
-        self._active_window.add(timestamp, value)
+        Raises:
+            ValueError: If lengths differ or timestamps are not non-decreasing; nothing
+                from the batch is added in that case
+        """
+        n = len(timestamps)
+        if n != len(values):
+            raise ValueError("timestamps and values must have the same length")
+        if not n:
+            return
+        # The bisects below need the whole batch ordered, so check it up front
+        last = self._last_ts
+        if (last is not None and timestamps[0] < last) or not all(
+            map(le, timestamps, islice(timestamps, 1, None))
+        ):
+            raise ValueError("timestamps must be non-decreasing")
 
-    def query_min_max(self, num_buckets: int = 0) -> tuple[Decimal, Decimal, int]:
+        pos = 0
+        while pos < n:
+            bucket_end = self._current_bucket_end
+            if bucket_end is None or timestamps[pos] >= bucket_end:
+                self._condense_active_bucket()
+                self._current_bucket_idx, bucket_end = self._locate_bucket(timestamps[pos])
+                self._current_bucket_end = bucket_end
+            # Small batches usually end inside the bucket, which one compare settles
+            if timestamps[-1] < bucket_end:
+                stop = n
+            else:
+                stop = bisect_left(timestamps, bucket_end, pos)
+
+            chunk = values[pos:stop]
+            low, high = min(chunk), max(chunk)
+            # Ties resolve to the latest occurrence, as in add()
+            if low <= self._active_min:
+                self._active_min = low
+                self._active_min_ts = timestamps[stop - 1 - chunk[::-1].index(low)]
+            if high >= self._active_max:
+                self._active_max = high
+                self._active_max_ts = timestamps[stop - 1 - chunk[::-1].index(high)]
+            self._active_count += stop - pos
+            pos = stop
+        self._last_ts = timestamps[-1]
+
+    def query_min_max(self, num_buckets: int = 0) -> tuple[float, float, int]:
         """
         Query min/max/max_count over active bucket + historical time range.
 
@@ -168,30 +301,66 @@ class BucketedSlidingAggregator:
         Note:
             For direction information on the active bucket, use get_active_direction().
         """
-        if num_buckets < 0:
-            raise ValueError("num_buckets must be non-negative")
-
-        # Start with active window min/max/count
-        min_value, _, max_value, _, max_count = self._get_active_window_stats()
+        # Start with active bucket min/max/count (inf/-inf/0 when it is empty).
+        # num_buckets=0 is the most frequent query, so it skips straight to the check
+        min_value, max_value, max_count = self._active_min, self._active_max, self._active_count
 
         # Add historical buckets if requested
         if num_buckets > 0:
-            hist_min, hist_max, hist_max_count = self._query_historical_buckets(num_buckets)
-            min_value = min(min_value, hist_min)
-            max_value = max(max_value, hist_max)
-            max_count = max(max_count, hist_max_count)
+            # Repeated lookbacks hit the per-lookback cache without a method call; result
+            # tuples are never empty, so ``or`` only falls through on a miss
+            hist = self._hist_cache.get(num_buckets) or self._query_historical_buckets(num_buckets)
+            hist_min, hist_max, hist_max_count = hist
+            # Inline comparisons rather than min()/max() builtin calls (per-tick path)
+            if hist_min < min_value:
+                min_value = hist_min
+            if hist_max > max_value:
+                max_value = hist_max
+            if hist_max_count > max_count:
+                max_count = hist_max_count
+        elif num_buckets < 0:
+            raise ValueError("num_buckets must be non-negative")
 
         # Check if we found any data
-        if min_value == DECIMAL_POS_INF:
+        if min_value == POS_INF:
             raise LookupError("window is empty")
 
         return min_value, max_value, max_count
 
+    def query_min_max_multi(self, windows: Iterable[int]) -> list[tuple[float, float, int]]:
+        """
+        Query several lookbacks at once, e.g. 1m/5m/15m/1h on one-minute buckets.
+
+        Each lookback is an O(1) sparse-table lookup (cached until the next condense),
+        so there is no shared scan to fuse; this is query_min_max per window.
+
+        Args:
+            windows: num_buckets values, as for query_min_max
+
+        Returns:
+            One (min_value, max_value, max_count) tuple per window, in order
+
+        Raises:
+            ValueError: If any window is negative
+            LookupError: If the window is empty
+        """
+        query = self.query_min_max
+        return [query(num_buckets) for num_buckets in windows]
+
     @property
     def buckets_count(self) -> int:
-        return len(self._buckets)
-
-    def get_active_direction(self) -> Decimal:
+        return len(self._bucket_ids) - self._ids_offset
+
+    def iter_buckets(self) -> Iterator[Bucket]:
+        """Materialize the retained condensed buckets, oldest first."""
+        epoch, span = self._epoch, self._bucket_span
+        for bucket_idx, (min_value, max_value, count) in zip(
+            self._bucket_ids[self._ids_offset :], self._range_table.leaves(), strict=True
+        ):
+            start = epoch + bucket_idx * span
+            yield Bucket(start, start + span, min_value, max_value, count)
+
+    def get_active_direction(self) -> float:
         """
         Get direction for the current active bucket only.
 
@@ -214,9 +383,9 @@ class BucketedSlidingAggregator:
             elif direction < 0:
                 print("Price trending downward")
         """
-        min_value, min_ts, max_value, max_ts, _ = self._get_active_window_stats()
+        min_value, min_ts, max_value, max_ts, count = self._get_active_window_stats()
 
-        if min_value == DECIMAL_POS_INF or max_value == DECIMAL_NEG_INF:
+        if not count:
             raise LookupError("active window is empty")
 
         return self._compute_direction(min_value, min_ts, max_value, max_ts)
@@ -227,84 +396,77 @@ class BucketedSlidingAggregator:
 
     def _get_active_window_stats(
         self,
-    ) -> tuple[Decimal, Optional[datetime], Decimal, Optional[datetime], int]:
+    ) -> tuple[float, Optional[datetime], float, Optional[datetime], int]:
         """
-        Get min/max/timestamps/count from active window.
+        Get min/max/timestamps/count of the active bucket.
 
         Returns:
             (min_value, min_timestamp, max_value, max_timestamp, count)
             or (inf, None, -inf, None, 0) if empty
 
         Note:
-            This method returns timestamps to enable direction calculation.
-            For simple min/max queries without direction, timestamps can be ignored.
+            Only direction needs the timestamps; query_min_max reads the min/max/count
+            scalars directly.
         """
-        try:
-            min_point = self._active_window.current_min()
-            max_point = self._active_window.current_max()
-            count = len(self._active_window._points)
-            return min_point.value, min_point.timestamp, max_point.value, max_point.timestamp, count
-        except LookupError:
-            return DECIMAL_POS_INF, None, DECIMAL_NEG_INF, None, 0
+        return (
+            self._active_min,
+            self._active_min_ts,
+            self._active_max,
+            self._active_max_ts,
+            self._active_count,
+        )
 
     def _condense_active_bucket(self) -> None:
         """
-        Condense active window into a bucket aggregate.
+        Condense the active bucket into the history columns.
 
-        Creates a bucket from the active window, appends it to history,
-        handles eviction, and resets the active window.
+        Appends the active bucket's min/max/count, handles eviction, and resets the
+        active bucket to neutral.
         """
-        if self._current_bucket_start is None:
+        if self._current_bucket_end is None:
             return
+        self._hist_cache.clear()
 
-        # Create bucket from active window
-        bucket = self._create_bucket_from_active_window()
-        self._buckets.append(bucket)
+        # A bucket only starts on a tick, so it is never empty here: spans without ticks
+        # are absent ids rather than (inf, -inf, 0) leaves, and no query has empty leaves
+        # to skip.
+        min_value, max_value, count = self._active_min, self._active_max, self._active_count
+        self._bucket_ids.append(self._current_bucket_idx)
+        self._range_table.append_leaf(min_value, max_value, count)
 
         # Evict old buckets if needed
         self._evict_old_buckets()
 
-        # Mark tree for rebuild and reset active window
-        self._tree_dirty = True
-        self._active_window = SlidingWindowMinMax(window=timedelta(days=1))
-
-    def _create_bucket_from_active_window(self) -> Bucket:
-        """
-        Create a bucket from the current active window state.
-
-        Returns:
-            Bucket with aggregated data or empty bucket if no points
-        """
-        # Type guard - this method is only called when _current_bucket_start is not None
-        assert self._current_bucket_start is not None
-        bucket_end = self._current_bucket_start + self._bucket_span
-
-        if not self._active_window._points:
-            # Empty bucket for continuity
-            return Bucket(start=self._current_bucket_start, end=bucket_end)
-
-        # Extract aggregates (O(1) operations)
-        return Bucket(
-            start=self._current_bucket_start,
-            end=bucket_end,
-            min_value=self._active_window.current_min().value,
-            max_value=self._active_window.current_max().value,
-            count=len(self._active_window._points),
-        )
+        # Reset the active bucket
+        self._active_min, self._active_max, self._active_count = POS_INF, NEG_INF, 0
+        self._active_min_ts = self._active_max_ts = None
 
     def _evict_old_buckets(self) -> None:
         """Evict buckets beyond max_window if configured."""
-        if self._max_window is not None:
-            while len(self._buckets) > self._max_window:
-                self._buckets.popleft()
+        if self._max_window is None:
+            return
+        excess = self.buckets_count - self._max_window
+        if excess > 0:
+            table = self._range_table
+            for _ in range(excess):
+                table.evict_leaf()
+            # Deleting the evicted ids every time would memmove the whole list per
+            # condense; advance the offset and trim the prefix in amortized O(1)
+            offset = self._ids_offset = self._ids_offset + excess
+            if offset > len(self._bucket_ids) - offset:
+                del self._bucket_ids[:offset]
+                self._ids_offset = 0
 
     # ========================================================================
     # Historical Bucket Queries
     # ========================================================================
 
-    def _query_historical_buckets(self, num_buckets: int) -> tuple[Decimal, Decimal, int]:
+    def _query_historical_buckets(self, num_buckets: int) -> tuple[float, float, int]:
         """
-        Query min/max/max_count from historical buckets using segment tree.
+        Query min/max/max_count from historical buckets using the sparse table.
+
+        Only called on a _hist_cache miss (query_min_max probes the cache first); the
+        result is stored there until the next condense.
 
         Args:
             num_buckets: Number of bucket time spans to look back
@@ -312,62 +474,53 @@ class BucketedSlidingAggregator:
         Returns:
             (min_value, max_value, max_count) or (inf, -inf, 0) if no data
         """
-        if not self._buckets or self._current_bucket_start is None:
-            return DECIMAL_POS_INF, DECIMAL_NEG_INF, 0
+        if not self.buckets_count or self._current_bucket_end is None:
+            return POS_INF, NEG_INF, 0
 
-        # Lazy rebuild segment tree if needed
-        self._rebuild_tree_if_dirty()
+        # Calculate the bucket range in integer bucket ids and find its first position
+        left_idx = self._find_first_bucket_in_range(self._current_bucket_idx - num_buckets)
 
-        # Calculate time range and find bucket indices
-        lookback_start = self._current_bucket_start - num_buckets * self._bucket_span
-        left_idx = self._find_first_bucket_in_range(lookback_start)
+        if left_idx == -1:
+            result = POS_INF, NEG_INF, 0
+        else:
+            # Query sparse table for O(1) min/max/max_count
+            result = self._range_table.query(left_idx, self.buckets_count - 1)
+        self._hist_cache[num_buckets] = result
+        return result
 
-        if left_idx == -1 or self._segment_tree is None:
-            return DECIMAL_POS_INF, DECIMAL_NEG_INF, 0
-
-        # Query segment tree for O(log n) min/max/max_count
-        right_idx = len(self._buckets) - 1
-        tree_min, tree_max, tree_max_count = self._segment_tree.query(left_idx, right_idx)
-
-        return tree_min, tree_max, tree_max_count
-
-    def _rebuild_tree_if_dirty(self) -> None:
-        """Rebuild segment tree if marked dirty."""
-        if self._tree_dirty and self._buckets:
-            self._segment_tree = SegmentTreeMinMax(self._buckets)
-            self._tree_dirty = False
-
-    def _find_first_bucket_in_range(self, lookback_start: datetime) -> int:
+    def _find_first_bucket_in_range(self, first_bucket_idx: int) -> int:
         """
-        Binary search for first bucket within time range.
+        Find the position of the first retained bucket with id >= first_bucket_idx.
+
+        Ids are strictly increasing, so counting back from the newest bucket gives the
+        position the id would have with no gaps, and no bucket before that position can
+        hold it. When the id is there (the history has no gaps since it) no search is
+        needed; otherwise a binary search covers only the positions after it.
 
         Args:
-            lookback_start: Earliest timestamp to include
+            first_bucket_idx: Earliest bucket id (whole spans since the epoch) to include
 
         Returns:
-            Index of first bucket in range, or -1 if none found
+            Position of first bucket in range, or -1 if none found
         """
-        if not self._buckets:
+        bucket_ids = self._bucket_ids
+        offset = self._ids_offset
+        end = len(bucket_ids)
+        pos = end - 1 - (bucket_ids[-1] - first_bucket_idx)
+        if pos >= end:
             return -1
-
-        # Binary search for leftmost bucket with start >= lookback_start
-        left, right = 0, len(self._buckets)
-
-        while left < right:
-            mid = (left + right) // 2
-            if self._buckets[mid].start < lookback_start:
-                left = mid + 1
-            else:
-                right = mid
-
-        # Validate result
-        if left < len(self._buckets) and self._buckets[left].start >= lookback_start:
-            return left
-
-        return -1
+        if pos <= offset:
+            # Lookbacks reaching past the oldest retained bucket (the "whole history"
+            # query) need no search at all
+            if first_bucket_idx <= bucket_ids[offset]:
+                return 0
+            return bisect_left(bucket_ids, first_bucket_idx, offset) - offset
+        if bucket_ids[pos] == first_bucket_idx:
+            return pos - offset
+        return bisect_left(bucket_ids, first_bucket_idx, pos + 1) - offset
 
     # ========================================================================
-    # Time Alignment and Validation
+    # Time Alignment
     # ========================================================================
 
     def _align_to_bucket_boundary(self, timestamp: datetime) -> datetime:
@@ -384,29 +537,25 @@ class BucketedSlidingAggregator:
             For 1-minute buckets: 12:05:37 -> 12:05:00
             For 1-hour buckets: 14:23:45 -> 14:00:00
         """
-        epoch = datetime(1970, 1, 1, tzinfo=timestamp.tzinfo)
-        delta = timestamp - epoch
-        bucket_count = int(delta.total_seconds() // self._bucket_span.total_seconds())
-        return epoch + bucket_count * self._bucket_span
+        return self._locate_bucket(timestamp)[1] - self._bucket_span
 
-    def _is_new_bucket(self, bucket_start: datetime) -> bool:
-        """Check if we're crossing into a new bucket."""
-        return self._current_bucket_start is not None and bucket_start != self._current_bucket_start
-
-    def _validate_timestamp(self, timestamp: datetime) -> None:
+    def _locate_bucket(self, timestamp: datetime) -> tuple[int, datetime]:
         """
-        Validate that timestamp is non-decreasing.
-
-        Args:
-            timestamp: Timestamp to validate
+        Return (bucket id, bucket end) for timestamp.
 
-        Raises:
-            ValueError: If timestamp decreases
+        The id counts whole bucket spans since the Unix epoch in timestamp's tzinfo,
+        using exact timedelta floor division. Callers only keep the end (the boundary
+        the per-tick fast path compares against), so the start is never built.
         """
-        if self._buckets and timestamp < self._buckets[-1].end:
-            raise ValueError("timestamps must be non-decreasing")
-        if self._active_window._points and timestamp < self._active_window._points[-1].timestamp:
-            raise ValueError("timestamps must be non-decreasing")
+        # The epoch is only built for aware ticks, once per tzinfo (naive or aware ticks
+        # never mix: datetime refuses to compare them), and the span stays a timedelta,
+        # so no float seconds are computed per call
+        epoch = self._epoch
+        if epoch.tzinfo is not timestamp.tzinfo:
+            epoch = self._epoch = datetime(1970, 1, 1, tzinfo=timestamp.tzinfo)
+        span = self._bucket_span
+        bucket_idx = (timestamp - epoch) // span
+        return bucket_idx, epoch + (bucket_idx + 1) * span
 
     # ========================================================================
     # Direction Helpers
@@ -414,11 +563,11 @@ class BucketedSlidingAggregator:
 
     @staticmethod
     def _compute_direction(
-        min_value: Decimal,
+        min_value: float,
         min_timestamp: Optional[datetime],
-        max_value: Decimal,
+        max_value: float,
         max_timestamp: Optional[datetime],
-    ) -> Decimal:
+    ) -> float:
         """
         Compute the signed delta between the newer and older extremum.
 
@@ -426,7 +575,7 @@ class BucketedSlidingAggregator:
         earlier one (rising), while a negative value indicates a drop.
         """
         if min_timestamp is None or max_timestamp is None:
-            return Decimal(0)
+            return 0
         if min_timestamp <= max_timestamp:
             return max_value - min_value
         return min_value - max_value
@@ -437,7 +586,7 @@ class BucketedSlidingAggregator:
 # ============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class AggStates:
     """
     Aggregator state tracking for a symbol/timeframe combination.
@@ -456,12 +605,19 @@ class AggStates:
     - If no further escalation after cooldown period, the a/v score reduces by 1 until 0
 
     The direction field indicates price movement direction ("UP" or "DOWN").
+
+    ``magnitude`` (volatility_score * (activity_score + 1)) is kept current by the
+    methods that change the scores, so priority ordering reads a plain attribute.
     """
 
     cooldown_seconds: int
     volatility_score: int = 0
     activity_score: int = 0
     _last_mod: int = -99999  # Timestamp (seconds since epoch)
+    magnitude: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        self.magnitude = self.volatility_score * (self.activity_score + 1)
 
     def update(self, msg: "Message", now: datetime):
         """
@@ -475,34 +631,34 @@ class AggStates:
             self.volatility_score = msg.volatility_score
         if msg.activity_score > self.activity_score:
             self.activity_score = msg.activity_score
+        self.magnitude = self.volatility_score * (self.activity_score + 1)
 
     def should_notify(self, msg: "Message") -> bool:
         return (
             msg.volatility_score > self.volatility_score or msg.activity_score > self.activity_score
         )
 
-    def trigger(self, now: datetime):
-        """reset the coutdown timer on escalation"""
-        current_timestamp = int(now.timestamp())
-        self._last_mod = current_timestamp
+    def trigger(self, now_s: int):
+        """reset the coutdown timer on escalation (now_s: epoch seconds)"""
+        self._last_mod = now_s
 
-    def stepdown(self, now: datetime):
+    def stepdown(self, now_s: int):
         """
         Reduce scores by 1 after cooldown expires if no further escalation.
 
         Args:
-            now: Current timestamp
+            now_s: Current timestamp in integer epoch seconds (see TickData.epoch_s)
         """
         # if no further escalation after cooldown, reduce scores by 1 until 0
-        current_timestamp = int(now.timestamp())
-        time_since_last = current_timestamp - self._last_mod
+        time_since_last = now_s - self._last_mod
         if time_since_last >= self.cooldown_seconds:
             self.volatility_score = max(0, self.volatility_score - 1)
             self.activity_score = max(0, self.activity_score - 1)
-            self._last_mod = current_timestamp
+            self.magnitude = self.volatility_score * (self.activity_score + 1)
+            self._last_mod = now_s
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """
     Alert message with multi-dimensional scoring for volatility and activity.
@@ -524,7 +680,8 @@ class Message:
         timeframe: Time period (e.g., 'M1', 'M5', 'M30')
         time: Timestamp of the alert
         direction: Price movement direction ("UP" or "DOWN")
-        price_change: Absolute price change in the timeframe
+        price_change: Absolute price change in the timeframe (fixed-point int from scoring,
+            converted to Decimal when the alert is emitted)
         tick_count: Number of ticks in the timeframe
         volatility_deep: Log2 score of price change vs threshold
         volatility_broad: Historical span score for price change
@@ -536,7 +693,7 @@ class Message:
     timeframe: str | None = None
     time: datetime | None = None
     direction: str | None = None
-    price_change: Decimal | None = None
+    price_change: int | Decimal | None = None
     tick_count: int | None = None
     volatility_deep: int = 0
     volatility_broad: int = 1
@@ -574,11 +731,22 @@ class Message:
         )
 
 
-# Scoring thresholds for historical comparison
-V_RATIO_THRESHOLD, A_RATIO_THRESHOLD = Decimal(0.8), Decimal(0.8)
+# Scoring thresholds for historical comparison, as (numerator, denominator) of 0.8 so
+# the comparison stays in integer arithmetic
+V_RATIO_THRESHOLD, A_RATIO_THRESHOLD = (4, 5), (4, 5)
+
 
+def _log_score(change, threshold, _floor=math.floor, _log2=math.log2) -> int:
+    """Calculate logarithmic score for threshold exceedance."""
+    # math functions are bound as defaults so the per-tick call skips global lookups.
+    # Thresholds are validated > 0, so change >= threshold gives a ratio >= 1 and a
+    # non-negative log: no max(0, ...) clamp is needed.
+    return _floor(_log2(change / threshold)) if change >= threshold else 0
 
-def init_msg_from_scores(agg: BucketedSlidingAggregator, thresholds: tuple) -> Message:
+
+def init_msg_from_scores(
+    agg: BucketedSlidingAggregator, thresholds: tuple, pip_digits: int
+) -> Message:
     """
     Calculate multi-dimensional scores from aggregator data.
 
@@ -593,6 +761,8 @@ def init_msg_from_scores(agg: BucketedSlidingAggregator, thresholds: tuple) -> M
     Args:
         agg: BucketedSlidingAggregator (read-only, not mutated)
         thresholds: (volatility_threshold, activity_threshold) tuple
+        pip_digits: Decimal places the symbol is quoted with
+            (see models.TickData.quote_digits and models.fixed_into_pip)
 
     Returns:
         Message with calculated scores, or empty Message if thresholds are None
@@ -615,17 +785,10 @@ def init_msg_from_scores(agg: BucketedSlidingAggregator, thresholds: tuple) -> M
     msg.price_change = price_change
     msg.tick_count = tick_cnt
 
-    # Import here to avoid circular dependency
-    from zmqNotifier.models import into_pip
-
-    pip_change = into_pip(price_change)
-
-    def log_score(change, threshold):
-        """Calculate logarithmic score for threshold exceedance."""
-        return max(0, math.floor(math.log2(change / threshold))) if change >= threshold else 0
+    pip_change = fixed_into_pip(price_change, pip_digits)
 
-    volatility_deep = log_score(pip_change, vol_threshold)
-    activity_deep = log_score(tick_cnt, act_threshold)
+    volatility_deep = _log_score(pip_change, vol_threshold)
+    activity_deep = _log_score(tick_cnt, act_threshold)
 
     def calc_span_score(change, ratio_threshold, agg, item_getter):
         """
@@ -637,17 +800,19 @@ def init_msg_from_scores(agg: BucketedSlidingAggregator, thresholds: tuple) -> M
 
         Args:
             change: Current value to compare
-            ratio_threshold: Percentage threshold (e.g., 0.8 for 80%)
+            ratio_threshold: Ratio as (numerator, denominator), e.g. (4, 5) for 80%
             agg: BucketedSlidingAggregator to query
             item_getter: Function to extract value from (min, max, count) tuple
 
         Returns:
             Span score (number of exponential windows exceeded)
         """
+        numerator, denominator = ratio_threshold
+        scaled_change = change * denominator
         span_score, i = 1, 1
         while i < agg.buckets_count:
             max_span = item_getter(agg.query_min_max(i))
-            if max_span * ratio_threshold >= change:
+            if max_span * numerator >= scaled_change:
                 span_score, i = span_score + 1, i * 2
             else:
                 break
@@ -0,0 +1,45 @@
+"""
+Bucket builders and a brute-force reference for the range structure tests.
+
+Shared by test_segment_tree.py and test_sparse_table.py.
+"""
+
+import math
+import random
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+from zmqNotifier.tick_agg import Bucket
+
+BASE = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+SPAN = timedelta(minutes=1)
+
+
+def make_bucket(i: int, values: list[int]) -> Bucket:
+    start = BASE + i * SPAN
+    if not values:
+        return Bucket(start=start, end=start + SPAN)
+    return Bucket(
+        start=start,
+        end=start + SPAN,
+        min_value=min(values),
+        max_value=max(values),
+        count=len(values),
+    )
+
+
+def brute_force(buckets, left, right):
+    live = [b for b in list(buckets)[left : right + 1] if not b.is_empty]
+    if not live:
+        return math.inf, -math.inf, 0
+    return (
+        min(b.min_value for b in live),
+        max(b.max_value for b in live),
+        max(b.count for b in live),
+    )
+
+
+def random_bucket(rng: random.Random, i: int) -> Bucket:
+    count = rng.choice([0, 1, 2, 5])
+    return make_bucket(i, [rng.randint(1, 1000) for _ in range(count)])
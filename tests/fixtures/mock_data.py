@@ -2,20 +2,26 @@
 """
 Mock MT4 market data for testing.
 
-REAL_MARKET_DATA structure:
+load_market_data() structure:
 [('BTCUSD_M1', ('2025-09-15 09:55:58.893002', (1757940840, 114898.16, 114917.86, 114888.64, 114890.42, 66, 0, 0))...),
  ('BTCUSD_M5', ('2025-09-15 09:55:58.896449', (1757934900, 115489.69, 115710.88, 115435.11, 115658.48, 740, 0, 0))...),
  ('BTCUSD', ('2025-09-16 14:19:48.430725', (115006.13, 115023.24))...)]
 """
 
 import pickle
+from datetime import datetime
+from functools import cache
 from itertools import islice
 from pathlib import Path
 
 _PICKLE_PATH = Path(__file__).parent.parent.parent / "data" / "zmq_market_db.pickle"
 
-with _PICKLE_PATH.open("rb") as pf:
-    REAL_MARKET_DATA = pickle.load(pf)  # noqa: S301
+
+@cache
+def load_market_data() -> dict:
+    """Load the real market data pickle on first use (importing this module stays cheap)."""
+    with _PICKLE_PATH.open("rb") as pf:
+        return pickle.load(pf)  # noqa: S301
 
 
 def market_data_generator(
@@ -26,11 +32,12 @@ def market_data_generator(
     """Generate batches of market data from real pickle file."""
     channel = symbol if timeframe is None else f"{symbol}_{timeframe}"
 
-    if channel not in REAL_MARKET_DATA:
+    market_data = load_market_data()
+    if channel not in market_data:
         yield {channel: {}}
         return
 
-    time_tuple = REAL_MARKET_DATA[channel]
+    time_tuple = market_data[channel]
     iterator = iter(time_tuple)
     while True:
         batch = list(islice(iterator, batch_size))
@@ -39,6 +46,20 @@ def market_data_generator(
         yield {channel: {k: time_tuple[k] for k in batch}}
 
 
+@cache
+def load_tick_columns(symbol: str = "BTCUSD") -> tuple[tuple[datetime, ...], tuple[float, ...]]:
+    """
+    Recorded ticks as (timestamps, bid prices) columns, oldest first.
+
+    Parsed once per symbol, for feeding BucketedSlidingAggregator.add_batch directly in
+    stress tests and benchmarks rather than going through per-tick dicts.
+    """
+    ticks = load_market_data().get(symbol, {})
+    timestamps = tuple(map(datetime.fromisoformat, ticks))
+    bids = tuple(bid for bid, _ask in ticks.values())
+    return timestamps, bids
+
+
 def mock_ohlc_data(symbol: str = "BTCUSD", timeframe: str = "M1", **kwargs):
     """Get single OHLC bar from real market data."""
     return next(market_data_generator(symbol=symbol, timeframe=timeframe, batch_size=1))
@@ -1,9 +1,11 @@
 # tests/test_bucketed_sliding_aggregator.py
-from datetime import datetime, timedelta
+import dataclasses
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
 import pytest
 
+from fixtures.mock_data import load_tick_columns
 from zmqNotifier.tick_agg import BucketedSlidingAggregator
 
 
@@ -67,12 +69,12 @@ def test_direction_only_available_for_active_bucket():
 
 
 def test_active_deque_only():
-    """Query with num_buckets=0 should only return active deque min/max."""
+    """Query with num_buckets=0 should only return active bucket min/max."""
     agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1))
     base = datetime(2024, 1, 1, 12, 0)
     agg.add(base, 10.0)
 
-    # Query active deque only (before boundary crossing)
+    # Query active bucket only (before boundary crossing)
     min_val, max_val, max_count = agg.query_min_max()
     assert min_val == 10.0
     assert max_val == 10.0
@@ -85,14 +87,14 @@ def test_active_deque_only():
 
     agg.add(base + timedelta(seconds=30), 12.0)
 
-    # Query active deque only (before boundary crossing)
+    # Query active bucket only (before boundary crossing)
     min_val, max_val, max_count = agg.query_min_max(num_buckets=0)
     assert min_val == 5.0
     assert max_val == 12.0
 
 
 def test_boundary_crossing_condenses_bucket():
-    """When time crosses bucket boundary, active deque should condense."""
+    """When time crosses bucket boundary, active bucket should condense."""
     agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1))
     base = datetime(2024, 1, 1, 12, 0)
 
@@ -103,7 +105,7 @@ def test_boundary_crossing_condenses_bucket():
     # Cross boundary - add point in next bucket [12:01, 12:02)
     agg.add(base + timedelta(minutes=1, seconds=10), 20.0)
 
-    # Query active deque only - should only see the new bucket's data
+    # Query active bucket only - should only see the new bucket's data
     min_val, max_val, max_count = agg.query_min_max(num_buckets=0)
     assert min_val == 20.0
     assert max_val == 20.0
@@ -111,7 +113,7 @@ def test_boundary_crossing_condenses_bucket():
     # Query with 1 past bucket - should include condensed first bucket
     min_val, max_val, max_count = agg.query_min_max(num_buckets=1)
     assert min_val == 5.0  # From condensed bucket
-    assert max_val == 20.0  # From active deque
+    assert max_val == 20.0  # From active bucket
 
 
 def test_multiple_buckets_and_clamping():
@@ -169,7 +171,19 @@ def test_max_window_eviction():
     # Query only 1 bucket (should not include the 20.0 from 12:01)
     min_val, max_val, max_count = agg.query_min_max(num_buckets=1)
     assert min_val == 5.0  # From 12:02 bucket
-    assert max_val == 7.0  # From active deque
+    assert max_val == 7.0  # From active bucket
+
+
+def test_whole_history_query_after_evicting_extrema():
+    """Unbounded lookbacks stay exact when eviction drops the global min or max."""
+    agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1), max_window=3)
+    base = datetime(2024, 1, 1, 12, 0)
+    # Extremes arrive first, so each eviction removes the current global min or max
+    values = [1.0, 99.0, 2.0, 98.0, 3.0, 97.0, 50.0, 50.0, 50.0]
+    for minute, value in enumerate(values):
+        agg.add(base + timedelta(minutes=minute), value)
+        window = values[max(0, minute - 3) : minute + 1]
+        assert agg.query_min_max(num_buckets=1000)[:2] == (min(window), max(window))
 
 
 def test_no_max_window_keeps_all_buckets():
@@ -191,13 +205,20 @@ def test_non_decreasing_timestamps_required():
     agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1))
     base = datetime(2024, 1, 1, 12, 0)
     agg.add(base, 1.0)
+    agg.add(base + timedelta(minutes=1, seconds=5), 3.0)
     with pytest.raises(ValueError):
         agg.add(base - timedelta(seconds=1), 2.0)
+    with pytest.raises(ValueError):
+        agg.add(base + timedelta(minutes=1), 2.0)
+
+    # Rejected ticks leave no trace
+    assert agg.buckets_count == 1
+    assert agg.query_min_max(num_buckets=1) == (1.0, 3.0, 1)
 
 
 def test_active_deque_exact_tracking():
     """
-    Test that the active deque provides exact min/max tracking within current bucket.
+    Test that the active bucket provides exact min/max tracking within current bucket.
     This replaces the old partial bucket approximation with exact values.
     """
     agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1))
@@ -209,12 +230,31 @@ def test_active_deque_exact_tracking():
     agg.add(base + timedelta(seconds=20), 9.0)  # New max
     agg.add(base + timedelta(seconds=30), 7.0)
 
-    # Query active deque - should get exact min/max
+    # Query active bucket - should get exact min/max
     min_val, max_val, max_count = agg.query_min_max(num_buckets=0)
     assert min_val == 2.0
     assert max_val == 9.0
 
 
+def test_bucket_lookup_only_runs_on_boundary_crossings(monkeypatch):
+    """Ticks inside the active bucket must not recompute its id or end."""
+    calls = []
+    locate = BucketedSlidingAggregator._locate_bucket
+
+    def counting_locate(self, timestamp):
+        calls.append(timestamp)
+        return locate(self, timestamp)
+
+    monkeypatch.setattr(BucketedSlidingAggregator, "_locate_bucket", counting_locate)
+    base = datetime(2024, 1, 1, 12, 0)
+    agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1))
+    for i in range(180):
+        agg.add(base + timedelta(seconds=i), i)
+    agg.add_batch([base + timedelta(seconds=180 + i) for i in range(120)], list(range(120)))
+
+    assert calls == [base + timedelta(minutes=m) for m in range(5)]
+
+
 def test_bucket_clock_alignment():
     """Test that buckets align to clock boundaries, not first timestamp."""
     agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1))
@@ -242,7 +282,7 @@ def test_empty_buckets_skipped():
     agg.add(base, 5.0)
     agg.add(base + timedelta(minutes=3), 10.0)  # Creates empty buckets at 12:01, 12:02
 
-    assert len(agg._buckets) == 1
+    assert agg.buckets_count == 1
 
     min_val, max_val, max_count = agg.query_min_max()
     assert min_val == 10.0
@@ -273,7 +313,7 @@ def test_two_minute_buckets_basic():
     agg.add(base + timedelta(seconds=30), 5.0)
     agg.add(base + timedelta(minutes=1), 15.0)
 
-    assert len(agg._buckets) == 0
+    assert agg.buckets_count == 0
 
     # Query active only
     min_val, max_val, max_count = agg.query_min_max(num_buckets=0)
@@ -366,7 +406,7 @@ def test_two_minute_buckets_max_window():
 
     # After evictions, should only have 2 condensed buckets: [12:02, 12:04) and [12:04, 12:06)
     # Plus active bucket [12:06, 12:08)
-    assert len(agg._buckets) == 2
+    assert agg.buckets_count == 2
 
     min_val, max_val, max_count = agg.query_min_max(num_buckets=10)
     assert min_val == 5.0
@@ -433,6 +473,32 @@ def test_one_hour_buckets_clock_alignment():
     assert max_val == 100.0
 
 
+@pytest.mark.parametrize(
+    "span",
+    [
+        timedelta(milliseconds=250),
+        timedelta(seconds=1),
+        timedelta(seconds=7),
+        timedelta(seconds=90),
+        timedelta(minutes=5),
+        timedelta(hours=1),
+    ],
+)
+def test_alignment_matches_integer_floor_for_any_span(span):
+    """One exact timedelta formula serves every span; no per-span special cases."""
+    agg = BucketedSlidingAggregator(bucket_span=span)
+    epoch = datetime(1970, 1, 1)
+    span_us = span // timedelta(microseconds=1)
+    for ts in (
+        datetime(2024, 1, 1, 12, 37, 42, 123456),
+        datetime(2024, 3, 9, 23, 59, 59, 999999),
+        datetime(2024, 7, 1),
+    ):
+        ts_us = (ts - epoch) // timedelta(microseconds=1)
+        expected = epoch + timedelta(microseconds=ts_us - ts_us % span_us)
+        assert agg._align_to_bucket_boundary(ts) == expected
+
+
 def test_one_hour_buckets_time_based_lookback():
     """Test time-based lookback with 1-hour buckets across a day."""
     agg = BucketedSlidingAggregator(bucket_span=timedelta(hours=1))
@@ -526,7 +592,7 @@ def test_one_hour_buckets_with_gaps():
     agg.add(day2, 105.0)
 
     # Only 1 condensed bucket exists (day1), active has day2 data
-    assert len(agg._buckets) == 1
+    assert agg.buckets_count == 1
 
     # Query 1 hour lookback - should only include active (from 08:00 onwards)
     min_val, max_val, max_count = agg.query_min_max(num_buckets=1)
@@ -552,7 +618,7 @@ def test_one_hour_buckets_max_window():
         agg.add(base + timedelta(hours=i), float(10 + i * 10))
 
     # Should only have 3 most recent condensed buckets
-    assert len(agg._buckets) == 3
+    assert agg.buckets_count == 3
 
     # Query all should only include last 3 buckets + active
     # Buckets kept: [12:00-13:00)=30, [13:00-14:00)=40, [14:00-15:00)=50, active [15:00-16:00)=60
@@ -793,3 +859,218 @@ def test_max_count_one_hour_buckets():
     # Query last 2 hours - should capture high activity period
     min_val, max_val, max_count = agg.query_min_max(num_buckets=1)
     assert max_count == 25  # From 10:00-11:00 bucket
+
+
+def test_interleaved_queries_match_fresh_aggregator():
+    """Incremental maintenance and cached lookbacks must match a fresh aggregator."""
+    base = datetime(2024, 1, 1, 12, 0)
+    ticks = [(base + timedelta(seconds=17 * i), float((i * 37) % 101)) for i in range(400)]
+
+    live = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1), max_window=20)
+    for i, (ts, value) in enumerate(ticks):
+        live.add(ts, value)
+        for num_buckets in (1, 3, 8, 25):
+            live.query_min_max(num_buckets)  # fills the per-lookback cache between condenses
+
+        if i % 50 == 49:
+            fresh = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1), max_window=20)
+            for fresh_ts, fresh_value in ticks[: i + 1]:
+                fresh.add(fresh_ts, fresh_value)
+            for num_buckets in (1, 3, 8, 25):
+                assert live.query_min_max(num_buckets) == fresh.query_min_max(num_buckets)
+
+
+def test_iter_buckets_derives_bounds_in_tick_timezone():
+    """History keeps only ids; bucket bounds are rebuilt in the ticks' tzinfo."""
+    tz = timezone(timedelta(hours=3))
+    base = datetime(2024, 1, 1, 12, 7, 30, tzinfo=tz)
+    agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=5))
+    for minutes in (0, 4, 16, 26):
+        agg.add(base + timedelta(minutes=minutes), float(minutes))
+
+    start = datetime(2024, 1, 1, 12, 5, tzinfo=tz)
+    span = timedelta(minutes=5)
+    assert [(b.start, b.end, b.count) for b in agg.iter_buckets()] == [
+        (start, start + span, 1),
+        (start + span, start + 2 * span, 1),
+        (start + 3 * span, start + 4 * span, 1),
+    ]
+    assert all(b.start.tzinfo is tz for b in agg.iter_buckets())
+
+
+def test_query_min_max_multi_matches_single_queries():
+    base = datetime(2024, 1, 1, 12, 0)
+    agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1), max_window=60)
+    for i in range(200):
+        agg.add(base + timedelta(seconds=40 * i), float((i * 37) % 101))
+
+    windows = [0, 1, 5, 15, 60, 1000]
+    assert agg.query_min_max_multi(windows) == [agg.query_min_max(n) for n in windows]
+    assert agg.query_min_max_multi([]) == []
+    with pytest.raises(ValueError):
+        agg.query_min_max_multi([1, -1])
+
+
+def test_lookback_cache_survives_in_bucket_ticks():
+    """Cached history results outlive active-bucket ticks and are dropped on condense."""
+    base = datetime(2024, 1, 1, 12, 0)
+    agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1))
+    for minute, value in enumerate([30.0, 10.0, 50.0]):
+        agg.add(base + timedelta(minutes=minute), value)
+
+    assert agg.query_min_max(num_buckets=2) == (10.0, 50.0, 1)
+    cached = agg._hist_cache[2]
+
+    # A new active extreme is merged in without recomputing the history
+    agg.add(base + timedelta(minutes=2, seconds=30), 5.0)
+    assert agg.query_min_max(num_buckets=2) == (5.0, 50.0, 2)
+    assert agg._hist_cache[2] is cached
+
+    agg.add(base + timedelta(minutes=3), 40.0)
+    assert 2 not in agg._hist_cache
+    assert agg.query_min_max(num_buckets=2) == (5.0, 50.0, 2)
+
+
+def test_lookback_before_max_window_fills():
+    """Lookbacks must be exact while fewer than max_window buckets are retained."""
+    base = datetime(2024, 1, 1, 12, 0)
+    agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1), max_window=10)
+    for i, value in enumerate([50, 10, 40, 30, 20, 70, 25, 60]):
+        agg.add(base + timedelta(minutes=i), value)
+
+    assert agg.buckets_count == 7
+    assert agg.query_min_max(num_buckets=3) == (20, 70, 1)
+    assert agg.query_min_max(num_buckets=7) == (10, 70, 1)
+    assert [b.min_value for b in agg.iter_buckets()] == [50, 10, 40, 30, 20, 70, 25]
+
+
+def test_unbounded_history_keeps_every_bucket_and_table_level():
+    """Without max_window every bucket stays, with one sparse table level per power of two."""
+    base = datetime(2024, 1, 1, 12, 0)
+    bounded = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1), max_window=16)
+    unbounded = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1))
+    values = [(i * 37) % 101 for i in range(1001)]
+    for i, value in enumerate(values):
+        bounded.add(base + timedelta(minutes=i), value)
+        unbounded.add(base + timedelta(minutes=i), value)
+
+    assert bounded.buckets_count == 16
+    assert unbounded.buckets_count == 1000
+    assert unbounded.query_min_max(num_buckets=1000) == (min(values), max(values), 1)
+    # Space is O(n log n): levels track log2 of the retained history, not of max_window
+    assert len(bounded._range_table._mins) <= (32).bit_length()  # live + untrimmed prefix
+    assert len(unbounded._range_table._mins) == (1000).bit_length()
+
+
+def test_iter_buckets_yields_read_only_snapshots():
+    """Materialized buckets are frozen copies; the aggregator's history is unaffected."""
+    base = datetime(2024, 1, 1, 12, 0)
+    agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1))
+    agg.add(base, 10)
+    agg.add(base + timedelta(minutes=1), 20)
+
+    (bucket,) = agg.iter_buckets()
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        bucket.min_value = 0
+    assert agg.query_min_max(num_buckets=1) == (10, 20, 1)
+
+
+@pytest.mark.parametrize("max_window", [12, 5, None])
+def test_find_first_bucket_in_range_with_gaps(max_window):
+    """The gap-free shortcut and bisect must agree with a plain search over retained ids."""
+    base = datetime(2024, 1, 1, 12, 0)
+    agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1), max_window=max_window)
+    for minute in [0, 1, 2, 5, 6, 9, 10, 11, 12, 13, 20, 21, 22, 23, 24, 25, 26, 27]:
+        agg.add(base + timedelta(minutes=minute), float(minute))
+
+    ids = [int((b.start - datetime(1970, 1, 1)) / timedelta(minutes=1)) for b in agg.iter_buckets()]
+    # 17 buckets condensed; with max_window=5 the evicted id prefix has been trimmed
+    assert agg.buckets_count == (max_window or 17)
+    for target in range(ids[0] - 3, ids[-1] + 3):
+        expected = next((pos for pos, bucket_id in enumerate(ids) if bucket_id >= target), -1)
+        assert agg._find_first_bucket_in_range(target) == expected
+
+
+@pytest.mark.parametrize("max_window", [None, 6])
+def test_add_batch_matches_per_tick_add(max_window):
+    """Batches (including whole buckets condensed from slices) must match add()."""
+    base = datetime(2024, 1, 1, 12, 0, 5)
+    ticks = []
+    for i in range(300):
+        if (i // 20) % 7 == 3:
+            continue  # leave gaps of empty buckets
+        ticks.append((base + timedelta(seconds=7 * i), (i * 37) % 101))
+
+    single = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1), max_window=max_window)
+    batched = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1), max_window=max_window)
+    for start in range(0, len(ticks), 45):
+        chunk = ticks[start : start + 45]
+        for ts, value in chunk:
+            single.add(ts, value)
+        batched.add_batch([ts for ts, _ in chunk], [value for _, value in chunk])
+
+        assert list(batched.iter_buckets()) == list(single.iter_buckets())
+        for num_buckets in (0, 1, 4, 50):
+            assert batched.query_min_max(num_buckets) == single.query_min_max(num_buckets)
+        assert batched.get_active_direction() == single.get_active_direction()
+
+
+def test_add_batch_matches_per_tick_add_on_recorded_ticks():
+    timestamps, bids = load_tick_columns("BTCUSD")
+    assert timestamps
+    batched = BucketedSlidingAggregator(bucket_span=timedelta(seconds=5), max_window=20)
+    single = BucketedSlidingAggregator(bucket_span=timedelta(seconds=5), max_window=20)
+    batched.add_batch(timestamps, bids)
+    for timestamp, bid in zip(timestamps, bids):
+        single.add(timestamp, bid)
+
+    assert list(batched.iter_buckets()) == list(single.iter_buckets())
+    assert batched._get_active_window_stats() == single._get_active_window_stats()
+    for num_buckets in (0, 1, 10, 40):
+        assert batched.query_min_max(num_buckets) == single.query_min_max(num_buckets)
+
+
+def test_add_batch_rejects_unordered_batch_atomically():
+    base = datetime(2024, 1, 1, 12, 0)
+    agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1))
+    agg.add(base + timedelta(seconds=30), 5.0)
+
+    with pytest.raises(ValueError):
+        agg.add_batch([base + timedelta(seconds=10)], [1.0])
+    with pytest.raises(ValueError):
+        agg.add_batch(
+            [base + timedelta(minutes=1), base + timedelta(minutes=3), base + timedelta(minutes=2)],
+            [1.0, 2.0, 3.0],
+        )
+    with pytest.raises(ValueError):
+        agg.add_batch([base + timedelta(minutes=1)], [1.0, 2.0])
+
+    assert agg.buckets_count == 0
+    assert agg.query_min_max() == (5.0, 5.0, 1)
+
+
+def test_active_bucket_longer_than_a_day_keeps_every_tick():
+    """The active bucket never expires ticks, whatever the span."""
+    agg = BucketedSlidingAggregator(bucket_span=timedelta(days=7))
+    base = datetime(2024, 1, 1)  # a Monday; 1970-01-01 was a Thursday
+    agg.add(base, 1.0)
+    agg.add(base + timedelta(days=1, hours=12), 5.0)
+    agg.add(base + timedelta(days=2), 3.0)
+
+    assert agg.query_min_max() == (1.0, 5.0, 3)
+    assert agg.get_active_direction() == 4.0
+
+
+def test_direction_ties_resolve_to_latest_extremum():
+    agg = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1))
+    base = datetime(2024, 1, 1, 12, 0)
+    for second, value in [(0, 5.0), (10, 1.0), (20, 5.0), (30, 1.0)]:
+        agg.add(base + timedelta(seconds=second), value)
+    # The latest minimum (at :30) comes after the latest maximum (at :20): falling
+    assert agg.get_active_direction() == -4.0
+
+    batched = BucketedSlidingAggregator(bucket_span=timedelta(minutes=1))
+    batched.add_batch(
+        [base + timedelta(seconds=second) for second in (0, 10, 20, 30)], [5.0, 1.0, 5.0, 1.0]
+    )
+    assert batched.get_active_direction() == -4.0
@@ -12,7 +12,10 @@ from pydantic import ValidationError
 from zmqNotifier.models import MarketDataMessage
 from zmqNotifier.models import OHLCData
 from zmqNotifier.models import TickData
+from zmqNotifier.models import fixed_into_pip
+from zmqNotifier.models import from_fixed
 from zmqNotifier.models import into_pip
+from zmqNotifier.models import to_fixed
 
 
 def test_tick_data_valid() -> None:
@@ -273,3 +276,46 @@ def test_into_pip_integer_prices() -> None:
     assert into_pip(Decimal("100")) == 10
     assert into_pip(Decimal("50")) == 5
     assert into_pip(Decimal("10")) == 1
+
+
+def test_fixed_into_pip_matches_decimal_into_pip() -> None:
+    """Fixed-point pip conversion should agree with the Decimal implementation."""
+    for diff in ["0.00100", "0.00250", "0.100", "1.000", "10.00", "0.10", "100", "0.000200"]:
+        price_diff = Decimal(diff)
+        digits = max(0, -price_diff.as_tuple().exponent)
+        assert fixed_into_pip(to_fixed(price_diff), digits) == int(into_pip(price_diff))
+
+
+def test_tick_data_fixed_point_mid() -> None:
+    """Fixed-point mid price should mirror (bid + ask) / 2; precision follows the quotes."""
+    now = dt.now(tz=datetime.UTC)
+    even = TickData(datetime=now, bid=Decimal("1.1000"), ask=Decimal("1.1002"))
+    assert from_fixed(even.mid_fixed) == Decimal("1.1001")
+    assert even.quote_digits == 4
+
+    odd = TickData(datetime=now, bid=Decimal("154.015"), ask=Decimal("154.020"))
+    assert from_fixed(odd.mid_fixed) == Decimal("154.0175")
+    assert odd.quote_digits == 3
+
+
+def test_tick_data_derived_values_follow_copies() -> None:
+    """Ticks are frozen, and updated copies must not reuse the cached fixed-point values."""
+    now = dt.now(tz=datetime.UTC)
+    tick = TickData(datetime=now, bid=Decimal("1.1000"), ask=Decimal("1.1002"))
+    assert tick.bid_fixed == to_fixed(Decimal("1.1000"))
+    assert tick.quote_digits == 4
+
+    with pytest.raises(ValidationError):
+        tick.bid = Decimal("2.0")
+
+    later = now + datetime.timedelta(seconds=5)
+    copied = tick.model_copy(
+        update={"datetime": later, "bid": Decimal("1.09"), "ask": Decimal("1.10")}
+    )
+    assert copied.bid_fixed == to_fixed(Decimal("1.09"))
+    assert copied.ask_fixed == to_fixed(Decimal("1.10"))
+    assert copied.mid_fixed == to_fixed(Decimal("1.095"))
+    assert copied.quote_digits == 2
+    assert copied.epoch_s == tick.epoch_s + 5
+    assert tick.bid_fixed == to_fixed(Decimal("1.1000"))
+    assert tick.model_copy().mid_fixed == tick.mid_fixed
@@ -11,8 +11,9 @@ from zmqNotifier.config import (
     SymbolNotifierConfig,
     SymbolTrackerConfig,
 )
-from zmqNotifier.models import TickData
+from zmqNotifier.models import TickData, to_fixed
 from zmqNotifier.notifier import SymbolTracker, VolatilityNotifier, AggStates
+from zmqNotifier.notifier import Message, NotificationManager
 
 
 @pytest.fixture
@@ -152,6 +153,7 @@ class TestVolatilityNotifier:
         notifier.update_config(new_config)
 
         assert set(tracker._aggregators.keys()) == {"M1", "M5", "M30"}
+        assert sorted(tracker.timeframes) == ["M1", "M30", "M5"]
 
     def test_update_config_remove_timeframe(self, minimal_config):
         """update_config should remove aggregator when timeframe removed from symbol."""
@@ -216,6 +218,28 @@ class TestVolatilityNotifier:
         assert thresholds["M1"] == (50, 500)
         assert thresholds["M5"] == (100, 1000)
 
+        # Tracker's per-tick snapshot picks up the new thresholds too
+        tf_loop = {tf: (vol, act) for tf, _, _, vol, act in notifier._trackers["EURUSD"]._tf_loop}
+        assert tf_loop == {"M1": (50, 500), "M5": (100, 1000)}
+
+    def test_symbol_ids_stay_stable_across_config_updates(self, minimal_config):
+        notifier = VolatilityNotifier(config=minimal_config)
+        sid = notifier.symbol_id("EURUSD")
+        assert sid is not None
+
+        without_eurusd = AppSettings(
+            notifier=NotifierSettings(
+                symbols={"GBPUSD": SymbolNotifierConfig(thresholds={"M1": (10, 100)})}
+            )
+        )
+        notifier.update_config(without_eurusd)
+        assert notifier._tracker_list[sid] is None
+        notifier.on_tick_by_id(sid, TickData(datetime=datetime.now(UTC), bid=1.1, ask=1.2))
+
+        notifier.update_config(minimal_config)
+        assert notifier.symbol_id("EURUSD") == sid
+        assert notifier._tracker_list[sid] is notifier._trackers["EURUSD"]
+
     def test_update_config_idempotent(self, minimal_config):
         """update_config should be idempotent when called with same config."""
         notifier = VolatilityNotifier(config=minimal_config)
@@ -473,8 +497,8 @@ class TestSymbolTrackerOnTick:
         agg = tracker_with_config._aggregators["M1"]
         min_val, max_val, count = agg.query_min_max(num_buckets=0)
 
-        assert min_val == Decimal("1.1001")  # Mid-price
-        assert max_val == Decimal("1.1001")
+        assert min_val == to_fixed(Decimal("1.1001"))  # Fixed-point mid-price
+        assert max_val == to_fixed(Decimal("1.1001"))
         assert count == 1
 
     def test_on_tick_no_aggregators(self, minimal_config):
@@ -567,8 +591,8 @@ class TestSymbolTrackerOnTick:
         tracker.on_tick(
             TickData(
                 datetime=base + timedelta(minutes=35, seconds=1),
-                bid=Decimal("1.10020"),
-                ask=Decimal("1.10021"),
+                bid=Decimal("1.10200"),
+                ask=Decimal("1.10201"),
             )
         )
 
@@ -588,14 +612,82 @@ class TestSymbolTrackerOnTick:
         tracker.on_tick(
             TickData(
                 datetime=base + timedelta(minutes=35, seconds=3),
-                bid=Decimal("1.10040"),
-                ask=Decimal("1.10041"),
+                bid=Decimal("1.10400"),
+                ask=Decimal("1.10401"),
             )
         )
 
         assert tracker._agg_states["M1"].volatility_score == 2
+        assert tracker._agg_states["M1"].magnitude == 2  # 2 * (0 + 1)
         assert caplog.text.count("Escalated alert") == 1
 
+    def test_odd_quote_sum_does_not_rescale_pips(self):
+        """A tick whose bid + ask is odd must not change how later moves score in pips."""
+        config = AppSettings(
+            notifier=NotifierSettings(
+                symbols={"EURUSD": SymbolNotifierConfig(thresholds={"M1": (10, 50)})}
+            )
+        )
+
+        def m1_vol_score(ticks: list[tuple[str, str]]) -> int:
+            tracker = VolatilityNotifier(config=config)._trackers["EURUSD"]
+            base = datetime(2025, 1, 1, 12, 0, 0, tzinfo=UTC)
+            for i in range(35):
+                tracker.on_tick(
+                    TickData(
+                        datetime=base + timedelta(minutes=i),
+                        bid=Decimal("1.10000"),
+                        ask=Decimal("1.10002"),
+                    )
+                )
+            for second, (bid, ask) in enumerate(ticks):
+                tracker.on_tick(
+                    TickData(
+                        datetime=base + timedelta(minutes=35, seconds=second),
+                        bid=Decimal(bid),
+                        ask=Decimal(ask),
+                    )
+                )
+            return tracker._agg_states["M1"].volatility_score
+
+        # 0.00200 move on 5-digit quotes = 20 pips = 2x threshold -> score 1
+        even = [("1.10000", "1.10002"), ("1.10200", "1.10202")]
+        odd = [("1.10000", "1.10001"), *even]
+        assert m1_vol_score(even) == 1
+        assert m1_vol_score(odd) == 1
+
+        # 0.00020 move is only 2 pips, with or without an odd-sum tick
+        small = [("1.10000", "1.10002"), ("1.10020", "1.10022")]
+        assert m1_vol_score(small) == 0
+        assert m1_vol_score([("1.10000", "1.10001"), *small]) == 0
+
+    def test_alert_price_change_uses_quote_precision(self, tracker_with_config, monkeypatch):
+        """Alert price change should be shown at the symbol's quote digits, not fixed-point."""
+        sent: list[Message] = []
+        monkeypatch.setattr("zmqNotifier.notifier.notify_manager.enqueue", sent.append)
+        tracker = tracker_with_config
+        base = datetime(2025, 1, 1, 12, 0, 0, tzinfo=UTC)
+
+        for i in range(35):
+            tracker.on_tick(
+                TickData(
+                    datetime=base + timedelta(minutes=i),
+                    bid=Decimal("1.1000"),
+                    ask=Decimal("1.1002"),
+                )
+            )
+        for second, (bid, ask) in enumerate((("1.1000", "1.1001"), ("1.1200", "1.1202"))):
+            tracker.on_tick(
+                TickData(
+                    datetime=base + timedelta(minutes=35, seconds=second),
+                    bid=Decimal(bid),
+                    ask=Decimal(ask),
+                )
+            )
+
+        # The 8-decimal fixed-point difference is shown at the 4 quoted digits
+        assert [str(msg.price_change) for msg in sent] == ["0.0200"]
+
     def test_cooldown_expires_allows_renotification(self, tracker_with_config, caplog):
         """After cooldown expires, same score should trigger new notification."""
         tracker = tracker_with_config
@@ -700,7 +792,7 @@ class TestVolatilityNotifierOnTick:
         min_val, max_val, count = agg.query_min_max(num_buckets=0)
 
         assert count == 1
-        assert min_val == Decimal("1.1001")
+        assert min_val == to_fixed(Decimal("1.1001"))
 
     def test_on_tick_unknown_symbol(self, minimal_config, caplog):
         """on_tick should warn for unknown symbol."""
@@ -714,3 +806,143 @@ class TestVolatilityNotifierOnTick:
 
         notifier.on_tick("UNKNOWN", tick)
         assert "No tracker configured for symbol UNKNOWN" in caplog.text
+
+    def test_on_ticks_matches_per_tick_ingest(self, minimal_config):
+        """Batch ingest should leave aggregators in the same state as per-tick ingest."""
+        base = datetime(2025, 1, 1, 12, 0, 0, tzinfo=UTC)
+        ticks = [
+            (
+                symbol,
+                TickData(
+                    datetime=base + timedelta(seconds=20 * i),
+                    bid=Decimal("1.1000") + Decimal("0.0001") * (i % 7),
+                    ask=Decimal("1.1003") + Decimal("0.0001") * (i % 7),
+                ),
+            )
+            for i in range(30)
+            for symbol in ("EURUSD", "UNKNOWN")
+        ]
+        single = VolatilityNotifier(config=minimal_config)
+        for symbol, tick in ticks:
+            single.on_tick(symbol, tick)
+        batched = VolatilityNotifier(config=minimal_config)
+        batched.on_ticks(ticks)
+
+        for tf in ("M1", "M5"):
+            agg_single = single._trackers["EURUSD"]._aggregators[tf]
+            agg_batched = batched._trackers["EURUSD"]._aggregators[tf]
+            assert agg_batched.buckets_count == agg_single.buckets_count
+            for n in range(agg_single.buckets_count + 1):
+                assert agg_batched.query_min_max(n) == agg_single.query_min_max(n)
+
+    def test_on_ticks_pip_scale_ignores_odd_quote_sum(self, minimal_config):
+        """A batch containing an odd bid + ask tick must score pips like per-tick ingest."""
+        base = datetime(2025, 1, 1, 12, 0, 0, tzinfo=UTC)
+        history = [
+            ("EURUSD", TickData(datetime=base + timedelta(minutes=i), bid=1.1, ask=1.10002))
+            for i in range(35)
+        ]
+        spike = [
+            ("EURUSD", TickData(datetime=base + timedelta(minutes=35), bid=bid, ask=ask))
+            for bid, ask in (
+                (Decimal("1.10000"), Decimal("1.10001")),
+                (Decimal("1.10020"), Decimal("1.10022")),
+            )
+        ]
+        notifier = VolatilityNotifier(config=minimal_config)
+        notifier.on_ticks(history + spike)
+
+        tracker = notifier._trackers["EURUSD"]
+        assert tracker._pip_digits == 5
+        # 0.0002 on 5-digit quotes is 2 pips, below the 10 pip M1 threshold
+        assert tracker._agg_states["M1"].volatility_score == 0
+
+    def test_on_ticks_scores_once_per_batch(self, minimal_config, monkeypatch):
+        """Batch ingest drops intermediate alerts that per-tick ingest reports."""
+        base = datetime(2025, 1, 1, 12, 0, 0, tzinfo=UTC)
+        history = [
+            TickData(
+                datetime=base + timedelta(minutes=i), bid=Decimal("1.10000"), ask=Decimal("1.10002")
+            )
+            for i in range(35)
+        ]
+        # 20 then 40 pip moves (M1 threshold 10): score 1, then escalation to score 2
+        spike = [
+            TickData(
+                datetime=base + timedelta(minutes=35, seconds=second),
+                bid=Decimal(bid),
+                ask=Decimal(bid) + Decimal("0.00002"),
+            )
+            for second, bid in enumerate(("1.10000", "1.10200", "1.10400"))
+        ]
+
+        def m1_alerts(batched: bool) -> list[int]:
+            sent: list[Message] = []
+            monkeypatch.setattr("zmqNotifier.notifier.notify_manager.enqueue", sent.append)
+            notifier = VolatilityNotifier(config=minimal_config)
+            for tick in history:
+                notifier.on_tick("EURUSD", tick)
+            if batched:
+                notifier.on_ticks([("EURUSD", tick) for tick in spike])
+            else:
+                for tick in spike:
+                    notifier.on_tick("EURUSD", tick)
+            return [msg.volatility_score for msg in sent if msg.timeframe == "M1"]
+
+        assert m1_alerts(batched=False) == [1, 2]
+        assert m1_alerts(batched=True) == [2]
+
+
+def test_agg_states_magnitude_follows_scores():
+    """AggStates.magnitude should track score escalation and stepdown."""
+    state = AggStates(cooldown_seconds=60)
+    now = datetime(2025, 1, 1, 12, 0, 0, tzinfo=UTC)
+
+    state.update(Message(volatility_deep=3, activity_deep=1), now)
+    assert state.magnitude == 3 * (1 + 1)
+
+    state.stepdown(int(now.timestamp()))
+    assert state.magnitude == 2 * (0 + 1)
+
+
+class TestNotificationManager:
+    """Test cases for NotificationManager queueing and flush throttling."""
+
+    def test_flush_empty_queue_is_noop(self, monkeypatch):
+        manager = NotificationManager()
+        monkeypatch.setattr(manager, "_format_batch_summary", lambda: pytest.fail("formatted"))
+
+        manager.flush()
+
+        assert manager._next_flush == 0.0
+
+    def test_flush_respects_interval(self, monkeypatch):
+        manager = NotificationManager()
+        clock = iter([100.0, 105.0, 116.0])
+        monkeypatch.setattr("zmqNotifier.notifier.time.monotonic", lambda: next(clock))
+
+        manager.enqueue(Message(symbol="EURUSD", timeframe="M1"))
+        manager.flush()  # first flush goes out immediately
+        assert manager.pending == 0
+
+        manager.enqueue(Message(symbol="EURUSD", timeframe="M5"))
+        manager.flush()  # within FLUSH_INTERVAL, held back
+        assert manager.pending == 1
+
+        manager.flush()  # interval elapsed
+        assert manager.pending == 0
+
+    def test_batch_orders_by_score_then_timeframe(self):
+        manager = NotificationManager()
+        manager.enqueue(Message(symbol="EURUSD", timeframe="M1", direction="UP", volatility_deep=1))
+        manager.enqueue(
+            Message(symbol="GBPUSD", timeframe="M1", direction="DOWN", volatility_deep=3)
+        )
+        manager.enqueue(Message(symbol="EURUSD", timeframe="M5", direction="UP", volatility_deep=1))
+
+        batch = manager._format_batch_summary()
+
+        headers = [line for line in batch.splitlines() if line.startswith("# ")]
+        assert headers == ["# GBPUSD M1 DOWN", "# EURUSD M5 UP", "# EURUSD M1 UP"]
+        assert batch.splitlines()[0] == "GBPUSD DOWN !!! EURUSD UP !"
+        assert manager.pending == 0
@@ -0,0 +1,34 @@
+import math
+import random
+from collections import deque
+
+import pytest
+
+from fixtures.buckets import brute_force
+from fixtures.buckets import make_bucket
+from fixtures.buckets import random_bucket
+from zmqNotifier.segment_tree import SegmentTreeMinMax
+
+
+def test_empty_tree_query_returns_neutral():
+    tree = SegmentTreeMinMax(deque())
+    assert tree.query(0, 0) == (math.inf, -math.inf, 0)
+
+
+def test_invalid_range_raises():
+    tree = SegmentTreeMinMax(deque([make_bucket(0, [1])]))
+    with pytest.raises(ValueError):
+        tree.query(0, 1)
+    with pytest.raises(ValueError):
+        tree.query(1, 0)
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 5, 7, 8, 9, 17, 33])
+def test_query_matches_brute_force(n):
+    rng = random.Random(n)
+    buckets = deque(random_bucket(rng, i) for i in range(n))
+    tree = SegmentTreeMinMax(buckets)
+    for left in range(n):
+        for right in range(left, n):
+            assert tree.query(left, right) == brute_force(buckets, left, right)
+
@@ -0,0 +1,78 @@
+import math
+import pickle
+import random
+from collections import deque
+
+import pytest
+
+from fixtures.buckets import brute_force
+from fixtures.buckets import make_bucket
+from fixtures.buckets import random_bucket
+from zmqNotifier.sparse_table import SparseTableMinMax
+from zmqNotifier.tick_agg import Bucket
+
+
+def test_empty_table_query_returns_neutral():
+    table = SparseTableMinMax(deque())
+    assert table.query(0, 0) == (math.inf, -math.inf, 0)
+
+
+def test_invalid_range_raises():
+    table = SparseTableMinMax(deque([make_bucket(0, [1])]))
+    with pytest.raises(ValueError):
+        table.query(0, 1)
+    with pytest.raises(ValueError):
+        table.query(1, 0)
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 5, 7, 8, 9, 17, 33])
+def test_query_matches_brute_force(n):
+    rng = random.Random(n)
+    buckets = deque(random_bucket(rng, i) for i in range(n))
+    table = SparseTableMinMax(buckets)
+    for left in range(n):
+        for right in range(left, n):
+            assert table.query(left, right) == brute_force(buckets, left, right)
+
+
+def test_append_and_evict_track_sliding_deque():
+    """Appends/evictions (including prefix trims) must match a brute-force scan."""
+    rng = random.Random(42)
+    buckets: deque[Bucket] = deque()
+    table = SparseTableMinMax(buckets)
+
+    for i in range(200):
+        bucket = random_bucket(rng, i)
+        buckets.append(bucket)
+        table.append_leaf(bucket.min_value, bucket.max_value, bucket.count)
+        while len(buckets) > rng.choice([5, 13, 21]):
+            buckets.popleft()
+            table.evict_leaf()
+
+        assert len(table) == len(buckets)
+        for left in range(len(buckets)):
+            right = rng.randrange(left, len(buckets))
+            assert table.query(left, right) == brute_force(buckets, left, right)
+
+
+def test_evict_empty_table_raises():
+    table = SparseTableMinMax(deque())
+    with pytest.raises(LookupError):
+        table.evict_leaf()
+
+
+def test_pickle_keeps_only_retained_leaves():
+    rng = random.Random(7)
+    buckets = deque(random_bucket(rng, i) for i in range(100))
+    table = SparseTableMinMax(buckets)
+    for _ in range(60):
+        buckets.popleft()
+        table.evict_leaf()
+
+    restored = pickle.loads(pickle.dumps(table))
+    assert len(restored) == len(buckets) == 40
+    assert list(restored.leaves()) == list(table.leaves())
+    assert restored.__getstate__() == table.__getstate__()
+    for left in range(len(buckets)):
+        for right in range(left, len(buckets)):
+            assert restored.query(left, right) == brute_force(buckets, left, right)
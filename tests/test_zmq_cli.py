@@ -5,7 +5,7 @@ from unittest.mock import patch
 
 import pytest
 
-from fixtures.mock_data import REAL_MARKET_DATA
+from fixtures.mock_data import load_market_data
 
 
 @pytest.fixture()
@@ -48,10 +48,10 @@ def zmq_client(mock_dwx_connector):
         client.shutdown()
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def real_market_data():
     """Load real market data from pickle file."""
-    return REAL_MARKET_DATA
+    return load_market_data()
 
 
 class TestZmqMt4ClientInitialization: